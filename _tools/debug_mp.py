@@ -1,26 +1,35 @@
 import sys
-print(f"Python Ver: {sys.version}")
 
-try:
-    import google.protobuf
-    print(f"Protobuf Ver: {google.protobuf.__version__}")
-except ImportError as e:
-    print(f"Protobuf Import Failed: {e}")
+def main():
+    """
+    Prints the Python, protobuf and MediaPipe versions and whether the legacy
+    mp.solutions API is importable. Diagnostic only; never imported by the backend.
+    """
+    print(f"Python Ver: {sys.version}")
 
-try:
-    import mediapipe as mp
-    print(f"MediaPipe Ver: {mp.__version__}")
-    
     try:
-        from mediapipe.python import solutions
-        print("Explicit 'from mediapipe.python import solutions' worked!")
-        mp.solutions = solutions
+        import google.protobuf
+        print(f"Protobuf Ver: {google.protobuf.__version__}")
     except ImportError as e:
-        print(f"Explicit Loading Failed: {e}")
+        print(f"Protobuf Import Failed: {e}")
+
+    try:
+        import mediapipe as mp
+        print(f"MediaPipe Ver: {mp.__version__}")
+    
+        try:
+            from mediapipe.python import solutions
+            print("Explicit 'from mediapipe.python import solutions' worked!")
+            mp.solutions = solutions
+        except ImportError as e:
+            print(f"Explicit Loading Failed: {e}")
         
-    print(f"Has solutions? {hasattr(mp, 'solutions')}")
-    if hasattr(mp, 'solutions'):
-        print(f"Face Mesh: {mp.solutions.face_mesh}")
+        print(f"Has solutions? {hasattr(mp, 'solutions')}")
+        if hasattr(mp, 'solutions'):
+            print(f"Face Mesh: {mp.solutions.face_mesh}")
+
+    except ImportError as e:
+        print(f"MediaPipe Import Failed: {e}")
 
-except ImportError as e:
-    print(f"MediaPipe Import Failed: {e}")
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ import librosa.display
 import numpy as np
 import os
 import matplotlib
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import uuid
 import warnings
 from backend.config import STATIC_DIR, UPLOAD_DIR, IS_VERCEL
@@ -92,22 +92,24 @@ def detect_fake_audio(audio_path):
         final_score = min(max(fake_score, 0.01), 0.99)
 
         # --- Graph Visualization ---
-        plt.figure(figsize=(10, 3))
+        # Standalone Figure (not pyplot's global state) so concurrent analyses can plot safely
+        fig = Figure(figsize=(10, 3))
+        ax = fig.subplots()
         # Draw waveform with dynamic color scheme based on threat analysis
         wave_color = '#FF3B30' if final_score > 0.5 else '#34C759'
-        librosa.display.waveshow(y, sr=sr, alpha=0.7, color=wave_color)
-        plt.title(f'Acoustic Waveform Profile (Realness: {int((1.0 - final_score)*100)}%)', color='white', pad=10)
-        plt.xlabel('Time (s)', color='lightgrey')
-        plt.ylabel('Amplitude', color='lightgrey')
+        librosa.display.waveshow(y, sr=sr, alpha=0.7, color=wave_color, ax=ax)
+        ax.set_title(f'Acoustic Waveform Profile (Realness: {int((1.0 - final_score)*100)}%)', color='white', pad=10)
+        ax.set_xlabel('Time (s)', color='lightgrey')
+        ax.set_ylabel('Amplitude', color='lightgrey')
         
         # Style the dark theme manually
-        plt.gca().set_facecolor('#1e1e1e')
-        plt.gcf().patch.set_facecolor('#1e1e1e')
-        plt.gca().tick_params(colors='lightgrey')
-        for spine in plt.gca().spines.values():
+        ax.set_facecolor('#1e1e1e')
+        fig.patch.set_facecolor('#1e1e1e')
+        ax.tick_params(colors='lightgrey')
+        for spine in ax.spines.values():
             spine.set_edgecolor('gray')
             
-        plt.tight_layout()
+        fig.tight_layout()
         
         filename = f"waveform_{uuid.uuid4().hex[:8]}.png"
         if IS_VERCEL:
@@ -117,8 +119,7 @@ def detect_fake_audio(audio_path):
             save_path = os.path.join(STATIC_DIR, filename)
             graph_url = f"/frontend/{filename}"
             
-        plt.savefig(save_path, facecolor=plt.gcf().get_facecolor(), edgecolor='none')
-        plt.close()
+        fig.savefig(save_path, facecolor=fig.get_facecolor(), edgecolor='none')
 
         # --- Detailed PDF/UI Report Data ---
         audio_report = {
@@ -0,0 +1,40 @@
+import os
+import sys
+import json
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+from backend.config import IMAGE_EXTS
+from backend.metadata import check_metadata
+from backend.steganography import analyze_steganography
+
+def _scan_one(file_path):
+    """
+    Runs the model-free forensic checks on one file: metadata for every file,
+    LSB steganography for images.
+    """
+    metadata_score, metadata_report = check_metadata(file_path)
+    result = {
+        "path": file_path,
+        "metadata_score": metadata_score,
+        "metadata": metadata_report,
+    }
+    if os.path.splitext(file_path)[1].lower() in IMAGE_EXTS:
+        result["steganography"] = analyze_steganography(file_path)
+    return result
+
+def scan_many(paths, max_workers=None):
+    """
+    Streams many files through check_metadata and analyze_steganography on a
+    process pool (one worker per core by default). Results are yielded in input order;
+    chunksize batches several files per task to amortize IPC cost. Workers are spawned,
+    not forked, so no lock or thread state from the parent leaks into them.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp.get_context("spawn")) as pool:
+        yield from pool.map(_scan_one, paths, chunksize=4)
+
+if __name__ == "__main__":
+    # Usage: python -m backend.batch <file> [<file> ...]  (one JSON result per line)
+    for scan_result in scan_many(sys.argv[1:]):
+        print(json.dumps(scan_result))
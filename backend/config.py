@@ -18,4 +18,22 @@ else:
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(STATIC_DIR, exist_ok=True)
 
+# Supported media extensions per analysis pipeline (lowercase, with leading dot)
+IMAGE_EXTS = frozenset({".jpg", ".jpeg", ".png"})
+VIDEO_EXTS = frozenset({".mp4", ".avi", ".mov"})
+AUDIO_EXTS = frozenset({".wav", ".mp3", ".ogg", ".flac"})
+
+# Overwrite uploaded artifacts with random bytes before unlinking them.
+# On journaling/copy-on-write filesystems (ext4, xfs, btrfs, APFS) and SSDs the
+# overwrite does not reach the original blocks, so deployments on such storage
+# can disable it with SECURE_WIPE=0 and fall back to a plain delete.
+SECURE_WIPE = os.getenv("SECURE_WIPE", "1") == "1"
+
+# Optional Redis for state shared across Uvicorn workers (e.g. rate limiting).
+# When unset, in-process fallbacks are used.
+REDIS_URL = os.getenv("REDIS_URL")
+
+# Worker processes for offline video analysis (0 runs it on a thread instead; serverless has no process pools)
+VIDEO_WORKERS = int(os.getenv("VIDEO_WORKERS", "0" if IS_VERCEL else "2"))
+
 DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{os.path.join(BASE_DIR, 'truthguard.db')}")
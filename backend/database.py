@@ -1,9 +1,19 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, Text, DateTime
+from sqlalchemy import create_engine, event, Column, Integer, String, Float, Text, DateTime
 from sqlalchemy.orm import declarative_base, sessionmaker
 from datetime import datetime
 from backend.config import DATABASE_URL
 
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+if DATABASE_URL.startswith("sqlite"):
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        # WAL lets history/report reads proceed while scans are being written,
+        # and synchronous=NORMAL drops the per-commit fsync (still crash-safe in WAL mode)
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -14,12 +24,16 @@ class ScanResult(Base):
     id = Column(Integer, primary_key=True, index=True)
     scan_id = Column(String, unique=True, index=True, nullable=False) # e.g., TG-8924
     filename = Column(String, nullable=False)
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    timestamp = Column(DateTime, default=datetime.utcnow, index=True) # History is served newest-first
     verdict = Column(String, nullable=False)
     fake_probability = Column(Float, nullable=False)
     details_json = Column(Text, nullable=False) # Store the full API response as JSON string
 
 Base.metadata.create_all(bind=engine)
+# create_all() skips existing tables, so make sure databases created before
+# an index was declared still receive it
+for index in ScanResult.__table__.indexes:
+    index.create(bind=engine, checkfirst=True)
 
 def get_db():
     db = SessionLocal()
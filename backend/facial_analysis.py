@@ -10,11 +10,12 @@ from backend.config import STATIC_DIR, UPLOAD_DIR, IS_VERCEL
 # Set absolute path for the downloaded face landmarker model
 MODEL_PATH = os.path.join(os.path.dirname(__file__), "face_landmarker.task")
 
-def analyze_facial_landmarks(video_path):
+def analyze_facial_landmarks(video_path, cancel_event=None):
     """
     Extracts facial landmarks from video frames and calculates geometric changes
     over time to detect manipulation such as deepfakes.
     Returns facial_score (0-1) and the path to the annotated image.
+    If cancel_event (a threading.Event) is set mid-scan, stops and returns the neutral (0.05, None).
     """
     if not os.path.exists(MODEL_PATH):
         # Graceful degradation if model missing
@@ -46,6 +47,9 @@ def analyze_facial_landmarks(video_path):
     annotated_face_url = None
     
     while True:
+        if cancel_event is not None and cancel_event.is_set():
+            cap.release()
+            return 0.05, None
         ret, frame = cap.read()
         if not ret or len(all_landmarks_across_frames) >= max_frames:
             break
@@ -6,6 +6,14 @@ from PIL import Image
 import os
 import numpy as np
 import cv2
+import threading
+
+# libjpeg-turbo gives SIMD JPEG decoding for live webcam frames; fall back to Pillow if absent
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    _TURBO_JPEG = TurboJPEG()
+except (ImportError, RuntimeError, OSError):
+    _TURBO_JPEG = None
 
 device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
@@ -56,12 +64,18 @@ class DeepfakeDetectionEngine:
             transforms.ToTensor(),
             transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
         ])
+        # Same preprocessing for frames that are already decoded into uint8 arrays
+        self.array_transform = transforms.Compose([
+            transforms.Resize((224, 224), antialias=True),
+            transforms.ConvertImageDtype(torch.float32),
+            transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
+        ])
 
-    def get_frequency_score(self, image_path):
+    def get_frequency_score(self, image_path, gray=None):
         """
         4. Add frequency-domain forensic analysis
         """
-        img = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        img = gray if gray is not None else cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
         if img is None:
             return 0.5
             
@@ -85,12 +99,12 @@ class DeepfakeDetectionEngine:
         score = min(max((high_freq_mag - 80) / 70.0, 0.0), 1.0)
         return float(score)
 
-    def get_texture_score(self, image_path):
+    def get_texture_score(self, image_path, gray=None):
         """
         5. Add texture anomaly detection 
         (Detect over-smoothed skin regions using Laplacian variance)
         """
-        img = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        img = gray if gray is not None else cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
         if img is None:
             return 0.5
             
@@ -100,9 +114,12 @@ class DeepfakeDetectionEngine:
         score = max(0.0, min(1.0, 1.0 - (laplacian_var / 300.0)))
         return float(score)
 
-    def predict(self, image_path):
+    def predict(self, image_path, mmap_view=None):
         """
         Executes Deepfake Binary Inference against target media asset.
+        The file is decoded once (in place when mmap_view, a read-only mmap of the
+        file, is given) and shared by the CNN, frequency and texture checks. Both
+        paths ignore EXIF orientation so the same file always yields the same pixels.
         """
         # 1. & 10. Remove dummy/heuristic fallback. Fail if weights missing.
         if not self.weights_loaded:
@@ -111,7 +128,22 @@ class DeepfakeDetectionEngine:
         if not os.path.exists(image_path):
             raise FileNotFoundError(f"Image file does not exist: {image_path}")
 
-        image = Image.open(image_path).convert('RGB')
+        decode_flags = cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION
+        if mmap_view is not None:
+            bgr = cv2.imdecode(np.frombuffer(mmap_view, dtype=np.uint8), decode_flags)
+        else:
+            bgr = cv2.imread(image_path, decode_flags)
+        if bgr is None:
+            raise ValueError(f"Could not decode image: {image_path}")
+        image = Image.fromarray(cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB))
+        gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+        return self._score_image(image, image_path, gray)
+
+    def _score_image(self, image, image_path, gray):
+        """
+        CNN + frequency + texture ensemble on a decoded PIL image; gray (when given)
+        spares the heuristics from re-reading image_path.
+        """
         input_tensor = self.transform(image).unsqueeze(0).to(self.device)
         
         # Must run with torch.no_grad()
@@ -120,9 +152,43 @@ class DeepfakeDetectionEngine:
             
         cnn_score = float(output_tensor.cpu().numpy()[0][0])
         
-        frequency_score = self.get_frequency_score(image_path)
-        texture_score = self.get_texture_score(image_path)
-        
+        frequency_score = self.get_frequency_score(image_path, gray)
+        texture_score = self.get_texture_score(image_path, gray)
+        return self._fuse_scores(cnn_score, frequency_score, texture_score)
+
+    def predict_array_batch(self, frames_bgr):
+        """
+        Same inference as predict() on already-decoded HxWx3 BGR uint8 frames (e.g. from
+        cv2.VideoCapture), so callers need no temp file round-trip. Every frame goes through
+        the CNN in a single forward pass (eval mode, so results match per-frame calls); the
+        cheap frequency/texture heuristics still run per frame.
+        Returns a list of (score, report) in input order.
+        """
+        if not self.weights_loaded:
+            raise RuntimeError("Deepfake model weights (deepfake_model.pth) failed to load. No heuristic fallback allowed.")
+        if len(frames_bgr) == 0:
+            return []
+
+        tensors = []
+        grays = []
+        for img_bgr in frames_bgr:
+            tensors.append(self.transform(Image.fromarray(cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB))))
+            grays.append(cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY))
+        input_tensor = torch.stack(tensors).to(self.device)
+
+        with torch.no_grad():
+            output_tensor = self.model(input_tensor)
+
+        cnn_scores = output_tensor.cpu().numpy()[:, 0]
+        return [
+            self._fuse_scores(float(cnn_score), self.get_frequency_score(None, gray), self.get_texture_score(None, gray))
+            for cnn_score, gray in zip(cnn_scores, grays)
+        ]
+
+    def _fuse_scores(self, cnn_score, frequency_score, texture_score):
+        """
+        Ensemble fusion, verdict banding and temperature calibration shared by all predict paths.
+        """
         # 6. Create ensemble fusion
         final_score = 0.75 * cnn_score + 0.15 * frequency_score + 0.10 * texture_score
         
@@ -173,11 +239,56 @@ class DeepfakeDetectionEngine:
             
         return float(output_tensor.cpu().numpy()[0][0])
 
-# Mount active singular model into RAM precisely once globally
-AI_VISION_MODULE = DeepfakeDetectionEngine()
+    def predict_live_frame_ndarray(self, rgb_frame):
+        """
+        Webcam inference on an already-decoded HxWx3 RGB uint8 frame.
+        Skips the intermediate PIL.Image allocation of predict_live_frame.
+        """
+        if not self.weights_loaded:
+            return 0.5
+            
+        frame_tensor = torch.from_numpy(np.ascontiguousarray(rgb_frame)).permute(2, 0, 1)
+        input_tensor = self.array_transform(frame_tensor).unsqueeze(0).to(self.device)
+        
+        with torch.no_grad():
+            output_tensor = self.model(input_tensor)
+            
+        return float(output_tensor.cpu().numpy()[0][0])
 
-def detect_fake_image(image_path):
+def decode_jpeg_frame(img_bytes):
+    """
+    Decodes JPEG bytes into an RGB uint8 ndarray, using libjpeg-turbo when available.
+    """
+    if _TURBO_JPEG is not None:
+        return _TURBO_JPEG.decode(img_bytes, pixel_format=TJPF_RGB)
+    import io
+    return np.asarray(Image.open(io.BytesIO(img_bytes)).convert('RGB'))
+
+# Mount active singular model into RAM precisely once per process, on first use.
+# Loading lazily (instead of at import) lets the server load weights from its
+# startup lifespan after worker processes are spawned, rather than in every importer.
+_VISION_ENGINE = None
+_VISION_ENGINE_LOCK = threading.Lock()
+
+def get_vision_engine():
+    """
+    Returns the process-wide DeepfakeDetectionEngine, loading weights on first call.
+    """
+    global _VISION_ENGINE
+    if _VISION_ENGINE is None:
+        with _VISION_ENGINE_LOCK:
+            if _VISION_ENGINE is None:
+                _VISION_ENGINE = DeepfakeDetectionEngine()
+    return _VISION_ENGINE
+
+def detect_fake_image(image_path, mmap_view=None):
     """
     Universal bridge handler matching the TruthGuard fusion API structure wrapper.
     """
-    return AI_VISION_MODULE.predict(image_path)
+    return get_vision_engine().predict(image_path, mmap_view=mmap_view)
+
+def detect_fake_image_batch(frames_bgr):
+    """
+    Scores several decoded BGR frames with one CNN forward pass (video pipeline).
+    """
+    return get_vision_engine().predict_array_batch(frames_bgr)
@@ -3,7 +3,7 @@ import numpy as np
 import librosa
 import mediapipe as mp
 import matplotlib
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import os
 import uuid
 import tempfile
@@ -32,11 +32,12 @@ def extract_audio_from_video(video_path, audio_path):
         print(f"Moviepy Extraction Failed: {e}")
         return False
 
-def detect_lipsync_mismatch(video_path):
+def detect_lipsync_mismatch(video_path, cancel_event=None):
     """
     Extracts mouth open distance and compares it chronologically with the acoustic energy 
     peaks of the synchronized audio track.
     Returns: lipsync_score (float 0.0-1.0), correlation (float), graph_url (str)
+    If cancel_event (a threading.Event) is set mid-scan, stops and returns the neutral (0.1, 0.0, None).
     """
     if not os.path.exists(MODEL_PATH):
         print("Model missing for Lipsync.")
@@ -87,7 +88,11 @@ def detect_lipsync_mismatch(video_path):
     frame_idx = 0
     max_frames = 150 # Check ~10s maximally
     
+    cancelled = False
     while True:
+        if cancel_event is not None and cancel_event.is_set():
+            cancelled = True
+            break
         ret, frame = cap.read()
         if not ret or len(mouth_distances) >= max_frames:
             break
@@ -123,7 +128,7 @@ def detect_lipsync_mismatch(video_path):
     except:
         pass
         
-    if len(mouth_distances) < 10:
+    if cancelled or len(mouth_distances) < 10:
         return 0.1, 0.0, None
         
     mouth_distances = np.array(mouth_distances)
@@ -142,15 +147,17 @@ def detect_lipsync_mismatch(video_path):
     if np.isnan(corr): corr = 0.0
     
     # --- 4. Graphical Artifact Generation ---
-    plt.figure(figsize=(10, 4))
-    plt.plot(video_times, mouth_distances, label='Mouth Opening Distance (Visual)', color='#0A84FF', linewidth=2)
-    plt.plot(video_times, interp_audio_energy, label='Audio Energy Peak (Acoustic)', color='#FF3B30', alpha=0.7)
-    plt.xlabel('Time (seconds)')
-    plt.ylabel('Normalized Magnitude')
-    plt.title('Lip-Sync Correlational Analysis: Visual vs Acoustic')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
+    # Standalone Figure (not pyplot's global state) so concurrent analyses can plot safely
+    fig = Figure(figsize=(10, 4))
+    ax = fig.subplots()
+    ax.plot(video_times, mouth_distances, label='Mouth Opening Distance (Visual)', color='#0A84FF', linewidth=2)
+    ax.plot(video_times, interp_audio_energy, label='Audio Energy Peak (Acoustic)', color='#FF3B30', alpha=0.7)
+    ax.set_xlabel('Time (seconds)')
+    ax.set_ylabel('Normalized Magnitude')
+    ax.set_title('Lip-Sync Correlational Analysis: Visual vs Acoustic')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
     
     filename = f"lipsync_{uuid.uuid4().hex[:8]}.png"
     if IS_VERCEL:
@@ -160,8 +167,7 @@ def detect_lipsync_mismatch(video_path):
         save_path = os.path.join(STATIC_DIR, filename)
         graph_url = f"/frontend/{filename}"
         
-    plt.savefig(save_path)
-    plt.close()
+    fig.savefig(save_path)
     
     # --- 5. Detection Scoring ---
     # In Deepfakes (HeyGen, D-ID, Native face-swaps), generating a mouth exactly correlated to audio is hard.
@@ -2,37 +2,89 @@ import shutil
 import time
 import os
 import uuid
-import traceback
+import io
+import re
+import mmap
 import asyncio
-import json
-import base64
-import requests
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+import binascii
+import numpy as np
+import orjson
 import hashlib
+# BLAKE3 (SIMD + multithreaded tree hashing) produces the content ID
+import blake3
+from functools import lru_cache
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import multiprocessing as mp
+import httpx
+import aiofiles
 from collections import defaultdict
 from urllib.parse import urlparse
 
 from fastapi import FastAPI, UploadFile, File, Request, WebSocket, WebSocketDisconnect, Form, Depends, BackgroundTasks, HTTPException
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
+from sqlalchemy import text
 from sqlalchemy.orm import Session 
 
-from backend.config import UPLOAD_DIR, STATIC_DIR, IS_VERCEL
+from backend.config import UPLOAD_DIR, STATIC_DIR, IS_VERCEL, SECURE_WIPE, DATABASE_URL, REDIS_URL, VIDEO_WORKERS, IMAGE_EXTS, VIDEO_EXTS, AUDIO_EXTS
 from backend.database import SessionLocal, ScanResult, get_db
-from backend.report import generate_pdf_report
 from backend.steganography import analyze_steganography
-from backend.virustotal import scan_hash_virustotal
+from backend.virustotal import scan_hash_virustotal_async, VT_CACHE_TTL_MALWARE, VT_CACHE_TTL_CLEAN
 
 # Import Analysis Modules
-from backend.image_model import detect_fake_image, AI_VISION_MODULE
+from backend.image_model import detect_fake_image, decode_jpeg_frame, get_vision_engine
 from backend.video_model import detect_fake_video
 from backend.audio_model import detect_fake_audio, predict_live_audio
 from backend.metadata import check_metadata
 from backend.fusion import combine 
 
+class _InProcessQueueHandler(QueueHandler):
+    """
+    QueueHandler whose records never leave the process, so prepare() can skip the
+    pickling-oriented pre-formatting (QueueHandler.prepare formats the message and
+    traceback on the emitting thread); the listener's handler formats them instead.
+    """
+    def prepare(self, record):
+        return record
+
+# Errors are logged through a queue so traceback formatting and stream I/O
+# happen on the listener thread instead of blocking the event loop.
+logger = logging.getLogger("truthguard")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_queue = queue.SimpleQueue()
+logger.addHandler(_InProcessQueueHandler(_log_queue))
+LOG_LISTENER = QueueListener(_log_queue, logging.StreamHandler())
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Loads the ML models once per server process at startup (after any worker
+    spawn/fork); releases shared clients on shutdown.
+    """
+    LOG_LISTENER.start()
+    # With a video process pool every pool worker already holds a copy of the model, so
+    # the web worker loads its own lazily (first image/live request) instead of up front.
+    if VIDEO_PROCESS_POOL is None:
+        await asyncio.to_thread(get_vision_engine)
+    yield
+    await HTTP_CLIENT.aclose()
+    LIVE_INFER_POOL.shutdown(wait=False, cancel_futures=True)
+    if VIDEO_PROCESS_POOL is not None:
+        VIDEO_PROCESS_POOL.shutdown(wait=False, cancel_futures=True)
+    if REDIS_CLIENT is not None:
+        await REDIS_CLIENT.aclose()
+    LOG_LISTENER.stop()
+
 app = FastAPI(
     title="TruthGuard Deepfake Detection API",
     description="Multi-modal deepfake detection system analyzing Video, Audio, Image, and Metadata.",
-    version="1.0.0" 
+    version="1.0.0",
+    lifespan=lifespan
 ) 
 
 from fastapi.middleware.cors import CORSMiddleware
@@ -61,31 +113,262 @@ class RateLimiter:
             raise HTTPException(status_code=429, detail="Rate Limit Exceeded: Maximum limit of requests per minute reached.")
         self.clients[client_ip].append(now)
 
-analyze_limiter = RateLimiter(requests=10, window=60)
+class RedisSlidingRateLimiter:
+    """
+    Sliding-window rate limiter backed by one Redis sorted set per client IP.
+    Eviction, counting and insertion run atomically in a Lua script, so the
+    limit holds across multiple Uvicorn workers, and EXPIRE reaps idle clients.
+    """
+    SCRIPT = """
+    local now = tonumber(ARGV[1])
+    local window = tonumber(ARGV[2])
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+    if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[3]) then
+        redis.call('ZADD', KEYS[1], now, ARGV[4])
+        redis.call('PEXPIRE', KEYS[1], window)
+        return 1
+    end
+    return 0
+    """
+
+    def __init__(self, requests: int, window: int, redis_client):
+        self.requests_limit = requests
+        self.window_ms = window * 1000
+        self.redis = redis_client
+        self.script = redis_client.register_script(self.SCRIPT)
+
+    async def __call__(self, request: Request):
+        client_ip = request.client.host if request.client else "127.0.0.1"
+        now_ms = int(time.time() * 1000)
+        # Unique member so concurrent requests in the same millisecond are all counted
+        member = f"{now_ms}-{uuid.uuid4().hex[:8]}"
+        allowed = await self.script(
+            keys=[f"ratelimit:{client_ip}"],
+            args=[now_ms, self.window_ms, self.requests_limit, member]
+        )
+        if not allowed:
+            raise HTTPException(status_code=429, detail="Rate Limit Exceeded: Maximum limit of requests per minute reached.")
+
+# Shared Redis connection pool (only when REDIS_URL is configured)
+if REDIS_URL:
+    import redis.asyncio as aioredis
+    REDIS_CLIENT = aioredis.from_url(REDIS_URL)
+    analyze_limiter = RedisSlidingRateLimiter(requests=10, window=60, redis_client=REDIS_CLIENT)
+else:
+    REDIS_CLIENT = None
+    analyze_limiter = RateLimiter(requests=10, window=60)
+
+# Dedicated, persistent worker threads for the live WebSocket streams. Keeping
+# per-frame inference off the default executor means 30 fps streams neither
+# queue behind nor starve the /analyze/ pipelines that use asyncio.to_thread.
+LIVE_INFER_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="live-infer")
+
+def predict_live_frame_ndarray(rgb_frame):
+    """Webcam inference on the process-wide vision engine (loaded on first use)."""
+    return get_vision_engine().predict_live_frame_ndarray(rgb_frame)
+
+async def run_live_inference(func, *args):
+    """Runs a live-stream decode/inference call on the dedicated worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(LIVE_INFER_POOL, func, *args)
+
+# Video analysis is the heaviest CPU-bound pipeline; running it in separate processes
+# keeps it from holding the GIL the event loop needs. Each worker loads the vision
+# model once via the initializer. "spawn" is safe with torch and works on Windows too.
+if VIDEO_WORKERS > 0:
+    VIDEO_PROCESS_POOL = ProcessPoolExecutor(
+        max_workers=VIDEO_WORKERS,
+        mp_context=mp.get_context("spawn"),
+        initializer=get_vision_engine
+    )
+else:
+    VIDEO_PROCESS_POOL = None
+
+async def run_video_analysis(file_path: str):
+    """Runs detect_fake_video on the process pool, or on a thread when the pool is disabled."""
+    if VIDEO_PROCESS_POOL is None:
+        return await asyncio.to_thread(detect_fake_video, file_path)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(VIDEO_PROCESS_POOL, detect_fake_video, file_path)
+
+async def vt_lookup(sha256_hash: str):
+    """
+    VirusTotal hash lookup with a Redis cache (shared across workers, when configured)
+    in front of the per-process cache in backend.virustotal.
+    The API call itself runs on the VirusTotal worker threads so it never blocks the event loop.
+    """
+    cache_key = f"vt:{sha256_hash}"
+    if REDIS_CLIENT is not None:
+        cached = await REDIS_CLIENT.get(cache_key)
+        if cached:
+            return orjson.loads(cached)
+
+    vt_report = await asyncio.wrap_future(scan_hash_virustotal_async(sha256_hash))
+
+    # Failed/simulated lookups are not cached so the next upload retries them
+    if REDIS_CLIENT is not None and "error" not in vt_report:
+        ttl = VT_CACHE_TTL_MALWARE if vt_report.get("is_malware") else VT_CACHE_TTL_CLEAN
+        await REDIS_CLIENT.setex(cache_key, ttl, orjson.dumps(vt_report))
+    return vt_report
+
+# Supported media extensions mapped to their analysis pipeline
+EXT_KIND = {
+    **dict.fromkeys(IMAGE_EXTS, "image"),
+    **dict.fromkeys(VIDEO_EXTS, "video"),
+    **dict.fromkeys(AUDIO_EXTS, "audio"),
+}
+
+# Fusion components in the order their scores are laid out for the threat-source argmax
+COMPONENT_NAMES = (
+    "Visual Rendering (Generative AI)",
+    "Facial Biometrics",
+    "Acoustic Envelope (Voice Synthesis)",
+    "Lip-Sync Correlation",
+    "Hardware & EXIF Metadata",
+)
+
+# Shared async HTTP client for URL ingestion. Pooled keep-alive connections
+# avoid a fresh TCP/TLS handshake per download and never block the event loop.
+HTTP_CLIENT = httpx.AsyncClient(
+    http2=True,
+    follow_redirects=True,
+    timeout=15.0,
+    limits=httpx.Limits(max_connections=50, max_keepalive_connections=50)
+)
+
+WIPE_BLOCK_SIZE = 1024 * 1024
 
 def secure_wipe_file(file_path: str):
     """
     Implements a rigorous secure wipe by overwriting the file with random bytes 
     before deleting it from the storage system (Zero-trust wipe).
+    The overwrite is streamed in 1 MiB blocks so memory use stays flat
+    regardless of file size, and can be disabled via the SECURE_WIPE setting.
     """
     try:
-        if os.path.exists(file_path):
-            file_size = os.path.getsize(file_path)
-            # Overwrite with random data
+        if SECURE_WIPE:
+            # Overwrite with random data; the size comes from the open descriptor (no extra stat calls)
             with open(file_path, "r+b") as f:
-                f.write(os.urandom(file_size))
-            # Delete the file
-            os.remove(file_path)
-            print(f"[SECURE WIPE] Evaluated artifact '{file_path}' successfully wiped and destroyed.")
-    except Exception as e:
-        print(f"[SECURE WIPE ERROR] Failed to wipe {file_path}: {e}")
+                remaining = os.fstat(f.fileno()).st_size
+                while remaining > 0:
+                    block = min(WIPE_BLOCK_SIZE, remaining)
+                    f.write(os.urandom(block))
+                    remaining -= block
+                f.flush()
+                # Only the data blocks matter here; skip the metadata flush where possible
+                if hasattr(os, "fdatasync"):
+                    os.fdatasync(f.fileno())
+                else:
+                    os.fsync(f.fileno())
+                # Evict the file's pages so wiped artifacts don't linger in RAM
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+        # Delete the file
+        os.remove(file_path)
+        logger.info("[SECURE WIPE] Evaluated artifact '%s' successfully wiped and destroyed.", file_path)
+    except FileNotFoundError:
+        # Already gone (e.g. removed by an error path); nothing to wipe
+        pass
+    except Exception:
+        logger.exception("[SECURE WIPE ERROR] Failed to wipe %s", file_path)
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# Algorithm behind content_id, reported next to it so the ID is never ambiguous
+CONTENT_ID_ALG = "blake3-256"
+
+def new_content_hash():
+    """
+    Hash context for the local content identifier (CONTENT_ID_ALG).
+    BLAKE3 hashes each 1 MiB chunk across all cores. SHA-256 is still computed
+    alongside because VirusTotal requires it.
+    """
+    return blake3.blake3(max_threads=blake3.blake3.AUTO)
+
+def hash_file(file_path: str):
+    """
+    Computes (sha256_hex, content_id_hex) of a file already on disk,
+    updating both hash contexts from a single 1 MiB-chunked read pass.
+    """
+    sha256_hash = hashlib.sha256()
+    content_hash = new_content_hash()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(HASH_BLOCK_SIZE):
+            sha256_hash.update(chunk)
+            content_hash.update(chunk)
+    return sha256_hash.hexdigest(), content_hash.hexdigest()
+
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024 # 50MB limit
+FILE_TOO_LARGE_ERROR = "File exceeds the 50MB size limit. Please upload a smaller file."
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+
+def safe_filename(filename: str) -> str:
+    """
+    Reduces a client-supplied name to a bare basename of safe characters so it
+    cannot traverse out of UPLOAD_DIR. The extension's case is left untouched.
+    """
+    name = os.path.basename((filename or "").replace("\\", "/"))
+    name = _UNSAFE_FILENAME_CHARS.sub("_", name).lstrip(".")
+    return name or "upload"
+
+def upload_path(prefix: str, filename: str) -> str:
+    """Builds a unique on-disk path for an incoming file (ns timestamp avoids collisions)."""
+    return os.path.join(UPLOAD_DIR, f"{prefix}_{time.time_ns()}_{safe_filename(filename)}")
+
+# Large images are memory-mapped so the decoder reads straight from the page cache
+MMAP_THRESHOLD_BYTES = 10 * 1024 * 1024
+
+def detect_fake_image_on_disk(file_path: str):
+    """Runs detect_fake_image, handing it a read-only mmap of the file when it is large."""
+    if os.path.getsize(file_path) <= MMAP_THRESHOLD_BYTES:
+        return detect_fake_image(file_path)
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mv:
+        return detect_fake_image(file_path, mmap_view=mv)
+
+def save_upload(source, file_path: str):
+    """
+    Streams an uploaded file object to disk in 1 MiB chunks, hashing each chunk
+    (SHA-256 + content id) in the same pass. Meant to run on a worker thread:
+    the reads/writes block, and hashlib releases the GIL for chunks this size.
+    Returns (sha256_hex, content_id_hex), or None if the upload is too large,
+    in which case the limit is checked before writing and the partial file is removed.
+    """
+    file_size = 0
+    too_large = False
+    sha256_hash = hashlib.sha256()
+    content_hash = new_content_hash()
+    with open(file_path, "wb") as buffer:
+        while chunk := source.read(HASH_BLOCK_SIZE):
+            file_size += len(chunk)
+            if file_size > MAX_UPLOAD_BYTES:
+                too_large = True
+                break
+            buffer.write(chunk)
+            sha256_hash.update(chunk)
+            content_hash.update(chunk)
+    if too_large:
+        os.remove(file_path)
+        return None
+    return sha256_hash.hexdigest(), content_hash.hexdigest()
+
+def persist_scan(scan_fields: dict):
+    """
+    Stores a finished scan in the database. Runs as a background task with its
+    own session so the SQLite commit/fsync stays off the response path.
+    """
+    try:
+        with SessionLocal() as db:
+            db.add(ScanResult(**scan_fields))
+            db.commit()
+    except Exception:
+        logger.exception("Failed to save to database")
 
 # Global Exception Handler to capture unhandled server errors and return JSON
 # instead of crashing, ensuring the frontend always receives a valid response.
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    print(f"Global Exception: {exc}")
-    traceback.print_exc()
+    logger.exception("Unhandled exception on %s", request.url.path, exc_info=exc)
     return JSONResponse(
         status_code=500,
         content={"error": "Internal Server Error", "detail": str(exc)},
@@ -108,7 +391,7 @@ async def read_root():
 # -------------------------------------------------------------------------
 
 @app.post("/analyze/", dependencies=[Depends(analyze_limiter)])
-async def analyze(background_tasks: BackgroundTasks, file: UploadFile = File(None), url: str = Form(None), db: Session = Depends(get_db)):
+async def analyze(background_tasks: BackgroundTasks, file: UploadFile = File(None), url: str = Form(None)):
     """
     Main entry point for deepfake analysis.
     1. Receives uploaded file or URL link.
@@ -125,45 +408,57 @@ async def analyze(background_tasks: BackgroundTasks, file: UploadFile = File(Non
         if url:
             parsed_url = urlparse(url)
             media_filename = os.path.basename(parsed_url.path)
-            if not media_filename or not media_filename.lower().endswith((".mp4", ".avi", ".mov", ".jpg", ".png", ".wav", ".mp3")):
+            kind = EXT_KIND.get(os.path.splitext(media_filename)[1].lower())
+            if kind is None:
                 media_filename = "downloaded_video.mp4" # fallback
+                kind = "video"
                 
-            file_path = os.path.join(UPLOAD_DIR, f"url_{int(time.time())}_{media_filename}")
+            file_path = upload_path("url", media_filename)
             
             try:
-                response = requests.get(url, stream=True, timeout=15)
-                response.raise_for_status()
-                file_hash = hashlib.sha256()
-                with open(file_path, "wb") as buffer:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        buffer.write(chunk)
-                        file_hash.update(chunk)
-                file_hash_hex = file_hash.hexdigest()
+                too_large = False
+                async with HTTP_CLIENT.stream("GET", url) as response:
+                    response.raise_for_status()
+                    # Fail fast on a declared oversize body before downloading anything
+                    if int(response.headers.get("Content-Length") or 0) > MAX_UPLOAD_BYTES:
+                        too_large = True
+                    else:
+                        downloaded = 0
+                        async with aiofiles.open(file_path, "wb") as buffer:
+                            async for chunk in response.aiter_bytes(1024 * 1024):
+                                downloaded += len(chunk)
+                                if downloaded > MAX_UPLOAD_BYTES:
+                                    too_large = True
+                                    break
+                                await buffer.write(chunk)
+                if too_large:
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
+                    return JSONResponse(status_code=413, content={"error": FILE_TOO_LARGE_ERROR})
+                # Hash in one C-level pass on a worker thread instead of per chunk on the event loop
+                file_hash_hex, content_id = await asyncio.to_thread(hash_file, file_path)
             except Exception as e:
                 return JSONResponse(status_code=400, content={"error": f"Failed to download from URL: {str(e)}"})
         else:
             media_filename = file.filename
-            file_path = os.path.join(UPLOAD_DIR, media_filename)
+            kind = EXT_KIND.get(os.path.splitext(media_filename)[1].lower())
+            if kind is None:
+                return JSONResponse(status_code=400, content={"error": "Unsupported file type"})
+            # Reject on the size Starlette already knows before writing a single byte
+            if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+                return JSONResponse(status_code=413, content={"error": FILE_TOO_LARGE_ERROR})
+            file_path = upload_path("upload", media_filename)
             # Save uploaded file safely, check for large files and avoid crashes
-            file_size = 0
-            file_hash = hashlib.sha256()
-            with open(file_path, "wb") as buffer:
-                while chunk := file.file.read(1024 * 1024): # Read in 1MB chunks
-                    file_size += len(chunk)
-                    if file_size > 50 * 1024 * 1024: # 50MB limit
-                        return JSONResponse(status_code=400, content={"error": "File exceeds the 50MB size limit. Please upload a smaller file."})
-                    buffer.write(chunk)
-                    file_hash.update(chunk)
-            file_hash_hex = file_hash.hexdigest()
+            hashes = await asyncio.to_thread(save_upload, file.file, file_path)
+            if hashes is None:
+                return JSONResponse(status_code=413, content={"error": FILE_TOO_LARGE_ERROR})
+            file_hash_hex, content_id = hashes
 
         # --- PRE-SCAN: ANTI-MALWARE INTELLIGENCE ---
-        # Ping VirusTotal API to ensure the file itself isn't a Trojan or Ransomware
-        vt_report = scan_hash_virustotal(file_hash_hex)
-        if vt_report.get("is_malware"):
-            # Threat identified! Abort forensic pipeline and destroy the artifact.
-            secure_wipe_file(file_path)
-            error_msg = f"QUARANTINE_ALERT|VirusTotal detected severe malware. File has been securely destroyed for your safety.|{vt_report.get('report_link', '')}"
-            return JSONResponse(status_code=403, content={"error": error_msg})
+        # Ping VirusTotal API to ensure the file itself isn't a Trojan or Ransomware.
+        # The lookup runs in the background while the forensic pipeline works; its
+        # verdict is checked before any result is returned or persisted.
+        vt_task = asyncio.create_task(vt_lookup(file_hash_hex))
 
         # --- 1. Initialize all module scores at start ---
         visual_score = 0.0
@@ -178,17 +473,30 @@ async def analyze(background_tasks: BackgroundTasks, file: UploadFile = File(Non
         checks = {}
         explanation = ""
         metadata_report = {}
-
-        is_image = media_filename.lower().endswith((".jpg", ".png", ".jpeg"))
-        is_video = media_filename.lower().endswith((".mp4", ".avi", ".mov"))
-        is_audio = media_filename.lower().endswith((".wav", ".mp3", ".ogg", ".flac"))
+        # False when the visual/facial analysis did not run, so its zero scores are not reported
+        visual_measured = True
+        facial_measured = True
+        threat_source_override = None
 
         # --- 2. Media-Specific Analysis pipelines ---
-        if is_image:
-            try:
-                metadata_score, metadata_report = check_metadata(file_path)
-            except Exception as e:
-                print(f"Metadata error: {e}")
+        if kind == "image":
+            # Cheap CPU-only checks run first (concurrently) so a confirmed
+            # steganographic payload can skip the expensive CNN forward pass.
+            metadata_result, steganography_report = await asyncio.gather(
+                asyncio.to_thread(check_metadata, file_path),
+                asyncio.to_thread(analyze_steganography, file_path),
+                return_exceptions=True
+            )
+
+            if isinstance(metadata_result, Exception):
+                logger.warning("Metadata error", exc_info=metadata_result)
+            else:
+                metadata_score, metadata_report = metadata_result
+                metadata_score = float(metadata_score)
+
+            if isinstance(steganography_report, Exception):
+                logger.warning("Steganography error", exc_info=steganography_report)
+                steganography_report = {"steganography_detected": False, "analysis": str(steganography_report)}
             
             risk_detail = "No major risks"
             if metadata_report and metadata_report.get('risk_flags'):
@@ -199,30 +507,32 @@ async def analyze(background_tasks: BackgroundTasks, file: UploadFile = File(Non
                 'report': metadata_report
             }
 
-            try:
-                visual_score, image_report = detect_fake_image(file_path)
-            except Exception as e:
-                print(f"Image error: {e}")
-                image_report = {"error": str(e)}
-
-            try:
-                steganography_report = analyze_steganography(file_path)
-            except Exception as e:
-                print(f"Steganography error: {e}")
-                steganography_report = {"steganography_detected": False, "analysis": str(e)}
-
-            facial_score = visual_score
-            
-            # 3. Dynamic Fusion Logic (Image)
-            final_score = 0.7 * visual_score + 0.3 * metadata_score
-
             if steganography_report.get("steganography_detected"):
-                final_score = max(final_score, 0.95)
+                # Verdict is already forced to critical; no need to run the CNN.
+                visual_measured = False
+                threat_source_override = "Steganography"
+                final_score = max(0.7 * visual_score + 0.3 * metadata_score, 0.95)
                 explanation = "CRITICAL: Malicious Steganographic Payload detected hidden within image pixels. Severe Risk."
+                image_report = {"skipped": "Visual CNN analysis skipped: steganographic payload already forces a critical verdict."}
+                visual_detail = "Visual analysis skipped (critical steganography risk)."
+            else:
+                try:
+                    visual_score, image_report = await asyncio.to_thread(detect_fake_image_on_disk, file_path)
+                    visual_score = float(visual_score)
+                except Exception as e:
+                    logger.exception("Image error")
+                    image_report = {"error": str(e)}
+                visual_detail = "Visual analysis complete."
+
+                # 3. Dynamic Fusion Logic (Image)
+                final_score = 0.7 * visual_score + 0.3 * metadata_score
+
+            facial_score = visual_score
 
             checks['visual'] = {
-                'pass': visual_score < 0.5,
-                'detail': "Visual analysis complete.",
+                # None marks a skipped check (neither passed nor failed)
+                'pass': visual_score < 0.5 if visual_measured else None,
+                'detail': visual_detail,
                 'report': image_report 
             }
             checks['steganography'] = {
@@ -231,11 +541,20 @@ async def analyze(background_tasks: BackgroundTasks, file: UploadFile = File(Non
                 'report': steganography_report
             }
 
-        elif is_video:
-            try:
-                metadata_score, metadata_report = check_metadata(file_path)
-            except Exception as e:
-                print(f"Metadata error: {e}")
+        elif kind == "video":
+            # Metadata, visual and audio-track pipelines are independent: run them concurrently
+            metadata_result, video_result, audio_result = await asyncio.gather(
+                asyncio.to_thread(check_metadata, file_path),
+                run_video_analysis(file_path),
+                asyncio.to_thread(detect_fake_audio, file_path),
+                return_exceptions=True
+            )
+
+            if isinstance(metadata_result, Exception):
+                logger.warning("Metadata error", exc_info=metadata_result)
+            else:
+                metadata_score, metadata_report = metadata_result
+                metadata_score = float(metadata_score)
             
             risk_detail = "No major risks"
             if metadata_report and metadata_report.get('risk_flags'):
@@ -246,21 +565,24 @@ async def analyze(background_tasks: BackgroundTasks, file: UploadFile = File(Non
                 'report': metadata_report
             }
 
-            try:
-                video_components, video_report = detect_fake_video(file_path)
-                visual_score = video_components.get('visual', 0.0)
-                facial_score = video_components.get('facial', 0.0)
-                lipsync_score = video_components.get('lipsync', 0.0)
-                temporal_score = video_components.get('temporal', 0.0)
-            except Exception as e:
-                print(f"Video pipeline error: {e}")
-                video_report = {"error": str(e)}
-
-            try:
-                audio_score, audio_report = detect_fake_audio(file_path)
-            except Exception as e:
-                print(f"Audio extraction/analysis error: {e}")
+            if isinstance(video_result, Exception):
+                logger.warning("Video pipeline error", exc_info=video_result)
+                video_report = {"error": str(video_result)}
+            else:
+                video_components, video_report = video_result
+                visual_score = float(video_components.get('visual', 0.0))
+                # The video fast path omits the facial/lip-sync components when those stages are skipped
+                facial_measured = 'facial' in video_components
+                facial_score = float(video_components.get('facial', 0.0))
+                lipsync_score = float(video_components.get('lipsync', 0.0))
+                temporal_score = float(video_components.get('temporal', 0.0))
+
+            if isinstance(audio_result, Exception):
+                logger.warning("Audio extraction/analysis error", exc_info=audio_result)
                 audio_report = {"error": "Audio track analysis failed or silent"}
+            else:
+                audio_score, audio_report = audio_result
+                audio_score = float(audio_score)
 
             # 3. Dynamic Fusion Logic (Video)
             final_score = (
@@ -281,11 +603,12 @@ async def analyze(background_tasks: BackgroundTasks, file: UploadFile = File(Non
                  'report': audio_report
             }
 
-        elif is_audio:
+        elif kind == "audio":
             try:
-                audio_score, audio_report = detect_fake_audio(file_path)
+                audio_score, audio_report = await asyncio.to_thread(detect_fake_audio, file_path)
+                audio_score = float(audio_score)
             except Exception as e:
-                print(f"Audio error: {e}")
+                logger.exception("Audio error")
                 audio_report = {"error": str(e)}
             
             # 3. Dynamic Fusion Logic (Audio)
@@ -297,36 +620,43 @@ async def analyze(background_tasks: BackgroundTasks, file: UploadFile = File(Non
                 'report': audio_report
             }
 
-        else:
-            return JSONResponse(status_code=400, content={"error": "Unsupported file type"})
-
         # Generate Explanation based on signals dynamically based on the highest threat indicator
-        max_threat_score = 0.0
-        threat_source = "None"
-        
-        components_map = {
-            "Visual Rendering (Generative AI)": facial_score if media_filename.lower().endswith((".jpg", ".png", ".jpeg")) else visual_score,
-            "Facial Biometrics": facial_score,
-            "Acoustic Envelope (Voice Synthesis)": audio_score if audio_score is not None else 0.0,
-            "Lip-Sync Correlation": lipsync_score,
-            "Hardware & EXIF Metadata": metadata_score
-        }
-        
-        for name, comp_score in components_map.items():
-            if comp_score > max_threat_score:
-                max_threat_score = comp_score
-                threat_source = name
+        # All scores are plain floats at this point (normalized where each detector returns).
+        # For images facial_score mirrors visual_score, so no per-kind branching is needed.
+        component_scores = np.array(
+            [visual_score, facial_score, audio_score, lipsync_score, metadata_score],
+            dtype=np.float32
+        )
+        top = int(component_scores.argmax())
+        max_threat_score = float(component_scores[top])
+        threat_source = COMPONENT_NAMES[top] if max_threat_score > 0.0 else "None"
+        if threat_source_override is not None:
+            threat_source = threat_source_override
                 
         if final_score > 0.5:
             explanation = f"Critical manipulation detected. The primary anomaly originates from: '{threat_source}'. Confidence in synthetic generation is high."
         else:
             explanation = "Extensive multi-modal analysis passes. No concrete indicators of digital manipulation or generative AI synthesis found."
 
+        vt_report = await vt_task
+        if vt_report.get("rate_limited"):
+            # The hash was never looked up: say so rather than implying a clean verdict
+            checks['virustotal'] = {
+                'pass': None,
+                'detail': "Not checked: VirusTotal rate limit exceeded.",
+                'report': vt_report
+            }
+        if vt_report.get("is_malware"):
+            # Threat identified! Discard the forensic results and destroy the artifact.
+            secure_wipe_file(file_path)
+            error_msg = f"QUARANTINE_ALERT|VirusTotal detected severe malware. File has been securely destroyed for your safety.|{vt_report.get('report_link', '')}"
+            return JSONResponse(status_code=403, content={"error": error_msg})
+
     except Exception as e:
         # Catch-all for unexpected pipeline failures
-        print(f"Error during analysis: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Analysis pipeline failed")
+        if 'vt_task' in locals():
+            vt_task.cancel()
         try:
             if 'file_path' in locals():
                 secure_wipe_file(file_path)
@@ -346,20 +676,20 @@ async def analyze(background_tasks: BackgroundTasks, file: UploadFile = File(Non
     voice_realness = "N/A"
     body_realness = "N/A"
 
-    if media_filename.lower().endswith((".jpg", ".png", ".jpeg")):
-        face_realness = max(0, 1.0 - facial_score)
+    if kind == "image" and visual_measured:
+        face_realness = max(0.0, 1.0 - facial_score)
         background_realness = min(1.0, face_realness + 0.2)
         body_realness = min(1.0, face_realness + 0.1)
     
-    elif media_filename.lower().endswith((".mp4", ".avi", ".mov")):
-        face_realness = max(0, 1.0 - facial_score)
-        background_realness = min(1.0, face_realness + 0.3)
-        body_realness = min(1.0, face_realness + 0.2)
-        if audio_score is not None:
-             voice_realness = max(0, 1.0 - audio_score)
+    elif kind == "video":
+        if facial_measured:
+            face_realness = max(0.0, 1.0 - facial_score)
+            background_realness = min(1.0, face_realness + 0.3)
+            body_realness = min(1.0, face_realness + 0.2)
+        voice_realness = max(0.0, 1.0 - audio_score)
 
-    elif media_filename.lower().endswith((".wav", ".mp3", ".ogg", ".flac")):
-        voice_realness = max(0, 1.0 - audio_score)
+    elif kind == "audio":
+        voice_realness = max(0.0, 1.0 - audio_score)
 
     # Final standardized JSON response    
     # -------------------------------------------------------------------------
@@ -371,14 +701,16 @@ async def analyze(background_tasks: BackgroundTasks, file: UploadFile = File(Non
         "scan_id": scan_id,
         "processing_time": f"{processing_time_sec} seconds",
         "file_hash_sha256": file_hash_hex,
-        "visual_score": round(float(visual_score), 3),
-        "audio_score": round(float(audio_score), 3),
-        "temporal_score": round(float(temporal_score), 3),
-        "metadata_score": round(float(metadata_score), 3),
-        "facial_score": round(float(facial_score), 3),
-        "lipsync_score": round(float(lipsync_score), 3),
-        "final_score": round(float(final_score), 3),
-        "fake_probability": round(float(final_score), 3),
+        "content_id": content_id,
+        "content_id_alg": CONTENT_ID_ALG,
+        "visual_score": round(visual_score, 3),
+        "audio_score": round(audio_score, 3),
+        "temporal_score": round(temporal_score, 3),
+        "metadata_score": round(metadata_score, 3),
+        "facial_score": round(facial_score, 3),
+        "lipsync_score": round(lipsync_score, 3),
+        "final_score": round(final_score, 3),
+        "fake_probability": round(final_score, 3),
         "verdict": "FAKE" if final_score > 0.5 else "REAL",
         "confidence_percentage": f"{int(final_score * 100)}%",
         "explanation": explanation,
@@ -389,66 +721,109 @@ async def analyze(background_tasks: BackgroundTasks, file: UploadFile = File(Non
         "highest_suspicious_module": threat_source,
         "checks": checks,
         "components": {
-            "face": round(float(face_realness) * 100, 1) if isinstance(face_realness, (int, float)) else face_realness,
-            "background": round(float(background_realness) * 100, 1) if isinstance(background_realness, (int, float)) else background_realness,
-            "voice": round(float(voice_realness) * 100, 1) if isinstance(voice_realness, (int, float)) else voice_realness,
-            "body": round(float(body_realness) * 100, 1) if isinstance(body_realness, (int, float)) else body_realness
+            "face": round(face_realness * 100, 1) if isinstance(face_realness, float) else face_realness,
+            "background": round(background_realness * 100, 1) if isinstance(background_realness, float) else background_realness,
+            "voice": round(voice_realness * 100, 1) if isinstance(voice_realness, float) else voice_realness,
+            "body": round(body_realness * 100, 1) if isinstance(body_realness, float) else body_realness
         }
     }
     
-    try:
-        new_scan = ScanResult(
-            scan_id=scan_id,
-            filename=media_filename,
-            verdict=response_payload["verdict"],
-            fake_probability=response_payload["fake_probability"],
-            details_json=json.dumps(response_payload)
-        )
-        db.add(new_scan)
-        db.commit()
-        db.refresh(new_scan)
-    except Exception as db_err:
-        print(f"Failed to save to database: {db_err}")
+    # Serialize once: the same bytes are stored in SQLite and sent to the client.
+    # OPT_SERIALIZE_NUMPY guards against numpy scalars leaking in via analyzer details.
+    payload_bytes = orjson.dumps(response_payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    
+    # Persist after the response is sent (scan_id is generated here, so no refresh is needed)
+    background_tasks.add_task(persist_scan, {
+        "scan_id": scan_id,
+        "filename": media_filename,
+        "verdict": response_payload["verdict"],
+        "fake_probability": response_payload["fake_probability"],
+        "details_json": payload_bytes.decode()
+    })
     
     # Schedule secure wiping of the media file to ensure Zero-Trust storage
     background_tasks.add_task(secure_wipe_file, file_path)
     
-    return response_payload
+    return Response(content=payload_bytes, media_type="application/json")
 
 # -------------------------------------------------------------------------
 # Dynamic PDF Generation Endpoint
 # -------------------------------------------------------------------------
+class ScanNotFoundError(LookupError):
+    pass
+
+@lru_cache(maxsize=256)
+def render_report_pdf(scan_id: str) -> bytes:
+    """
+    Renders the PDF report for a scan in memory. Scan rows are write-once, so the
+    bytes are cached per scan_id and repeat downloads skip the DB and reportlab.
+    Raises ScanNotFoundError (never cached) when the scan does not exist yet.
+    """
+    with SessionLocal() as db:
+        scan_record = db.query(ScanResult).filter(ScanResult.scan_id == scan_id).first()
+        if not scan_record:
+            raise ScanNotFoundError(scan_id)
+        # reportlab is only needed here, so it is imported on the first report rather than at startup
+        from backend.report import generate_pdf_report
+        pdf_buffer = io.BytesIO()
+        generate_pdf_report(scan_record, pdf_buffer)
+        return pdf_buffer.getvalue()
+
 @app.get("/report/{scan_id}")
-async def download_report(scan_id: str, db: Session = Depends(get_db)):
+async def download_report(scan_id: str):
     """
     Generates and downloads a PDF forensic report based on a scan ID.
     """
-    scan_record = db.query(ScanResult).filter(ScanResult.scan_id == scan_id).first()
-    
-    if not scan_record:
-         return JSONResponse(status_code=404, content={"error": "Scan ID not found in database."})
-         
-    # Generate PDF temporarily
     report_filename = f"TruthGuard_Report_{scan_id}.pdf"
-    report_path = os.path.join(UPLOAD_DIR, report_filename)
     
     try:
-        generate_pdf_report(scan_record, report_path)
-        return FileResponse(path=report_path, filename=report_filename, media_type='application/pdf')
+        pdf_bytes = await asyncio.to_thread(render_report_pdf, scan_id)
+    except ScanNotFoundError:
+        return JSONResponse(status_code=404, content={"error": "Scan ID not found in database."})
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("PDF report generation failed for scan %s", scan_id)
         return JSONResponse(status_code=500, content={"error": f"Failed to generate PDF: {str(e)}"})
+    
+    # Sent as a single body with Content-Length: no chunked encoding, no disk round trip
+    return Response(
+        content=pdf_bytes,
+        media_type='application/pdf',
+        headers={"Content-Disposition": f'attachment; filename="{report_filename}"'}
+    )
 
 # -------------------------------------------------------------------------
 # Threat History Endpoint
 # -------------------------------------------------------------------------
+# Same shape as the ORM fallback below; replace() turns SQLite's stored
+# "YYYY-MM-DD HH:MM:SS" into the isoformat "T" separator.
+HISTORY_JSON_QUERY = text("""
+    SELECT json_object('status', 'success', 'data', json_group_array(json_object(
+        'scan_id', scan_id,
+        'filename', filename,
+        'timestamp', replace(timestamp, ' ', 'T'),
+        'verdict', verdict,
+        'fake_probability', round(fake_probability * 100, 1)
+    )))
+    FROM (SELECT * FROM scans ORDER BY timestamp DESC LIMIT 50)
+""")
+
 @app.get("/history/")
 async def get_threat_history(db: Session = Depends(get_db)):
     """
     Fetches the latest 50 historical threat scans from the local SQLite database.
     """
     try:
-        scans = db.query(ScanResult).order_by(ScanResult.timestamp.desc()).limit(50).all()
+        if DATABASE_URL.startswith("sqlite"):
+            # SQLite builds the whole JSON body in C; no ORM rows or Python dicts are created
+            body = db.execute(HISTORY_JSON_QUERY).scalar()
+            return Response(content=body, media_type="application/json")
+        # Select only the listed columns so the (potentially large) details_json is never loaded
+        scans = (
+            db.query(ScanResult.scan_id, ScanResult.filename, ScanResult.timestamp, ScanResult.verdict, ScanResult.fake_probability)
+            .order_by(ScanResult.timestamp.desc())
+            .limit(50)
+            .all()
+        )
         history = []
         for scan in scans:
             history.append({
@@ -460,7 +835,7 @@ async def get_threat_history(db: Session = Depends(get_db)):
             })
         return {"status": "success", "data": history}
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("Failed to fetch scan history")
         return JSONResponse(status_code=500, content={"error": f"Failed to fetch history: {str(e)}"})
 
 # -------------------------------------------------------------------------
@@ -480,7 +855,7 @@ async def websocket_audio_endpoint(websocket: WebSocket):
             data = await websocket.receive_bytes()
             
             # Offload heavy acoustic inference tensor mapping to background thread asynchronously
-            fake_prob = await asyncio.to_thread(predict_live_audio, data)
+            fake_prob = await run_live_inference(predict_live_audio, data)
             
             verdict_payload = {
                 "status": "success",
@@ -491,14 +866,14 @@ async def websocket_audio_endpoint(websocket: WebSocket):
             }
             
             # Send immediate analysis back to the dashboard
-            await websocket.send_text(json.dumps(verdict_payload))
+            await websocket.send_bytes(orjson.dumps(verdict_payload))
             
     except WebSocketDisconnect:
-        print("Client disconnected from Live Stream.")
+        logger.info("Client disconnected from Live Stream.")
     except Exception as e:
-        print(f"WebSocket Error: {e}")
+        logger.exception("WebSocket Error")
         try:
-            await websocket.send_text(json.dumps({"status": "error", "message": str(e)}))
+            await websocket.send_bytes(orjson.dumps({"status": "error", "message": str(e)}))
         except:
             pass
 
@@ -506,40 +881,91 @@ async def websocket_audio_endpoint(websocket: WebSocket):
 async def websocket_video_endpoint(websocket: WebSocket):
     """
     Handles real-time frame streaming from the client's webcam.
-    Receives base64 encoded JPG frames, decodes them, and processes
-    them via the PyTorch vision heuristics.
+    Receives raw JPEG frames as binary messages (legacy clients may still send
+    base64 data URLs as text), decodes them, and processes them via the
+    PyTorch vision heuristics.
+    Frames are coalesced: while inference is busy only the newest pending
+    frame is kept, so latency stays bounded when the client outpaces the model.
     """
     await websocket.accept()
     
-    try:
+    latest_frame = None
+    frame_ready = asyncio.Event()
+
+    async def receive_frames():
+        nonlocal latest_frame
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
+            # Overwrite any frame the worker hasn't picked up yet
+            if message.get("bytes") is not None:
+                latest_frame = message["bytes"]
+                frame_ready.set()
+            elif (message.get("text") or "").startswith("data:image"):
+                latest_frame = message["text"]
+                frame_ready.set()
+
+    async def process_frames():
+        nonlocal latest_frame
         while True:
-            # Receive text data (base64 image URL) from browser
-            data = await websocket.receive_text()
+            await frame_ready.wait()
+            data = latest_frame
+            latest_frame = None
+            frame_ready.clear()
+
+            if isinstance(data, str):
+                # Legacy data URL: skip the prefix and base64-decode the payload in C
+                img_bytes = binascii.a2b_base64(data[data.find(",") + 1:])
+            else:
+                img_bytes = data
             
-            if data.startswith("data:image"):
-                # Strip the data URL prefix
-                header, encoded = data.split(",", 1)
-                img_bytes = base64.b64decode(encoded)
-                
-                # Execute LIVE internal neural network Vision Processing
-                fake_prob = await asyncio.to_thread(AI_VISION_MODULE.predict_live_frame, img_bytes)
-                
-                verdict_payload = {
-                    "status": "success",
-                    "fake_probability": fake_prob,
-                    "verdict": "FAKE" if fake_prob > 0.5 else "REAL",
-                    "bytes_analyzed": len(img_bytes),
-                    "timestamp": time.time()
-                }
-                
-                await websocket.send_text(json.dumps(verdict_payload))
+            # Decode the JPEG off the event loop (libjpeg-turbo when installed)
+            rgb_frame = await run_live_inference(decode_jpeg_frame, img_bytes)
+            
+            # Execute LIVE internal neural network Vision Processing
+            fake_prob = await run_live_inference(predict_live_frame_ndarray, rgb_frame)
+            
+            verdict_payload = {
+                "status": "success",
+                "fake_probability": fake_prob,
+                "verdict": "FAKE" if fake_prob > 0.5 else "REAL",
+                "bytes_analyzed": len(img_bytes),
+                "timestamp": time.time()
+            }
+            
+            await websocket.send_bytes(orjson.dumps(verdict_payload))
+
+    receiver = asyncio.create_task(receive_frames())
+    worker = asyncio.create_task(process_frames())
+    
+    try:
+        # Both loops run until one of them raises (disconnect or inference error)
+        done, pending = await asyncio.wait({receiver, worker}, return_when=asyncio.FIRST_EXCEPTION)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            task.result()
                 
     except WebSocketDisconnect:
-        print("Client disconnected from Webcam Stream.")
+        logger.info("Client disconnected from Webcam Stream.")
     except Exception as e:
-        print(f"Video WebSocket Error: {e}")
+        logger.exception("Video WebSocket Error")
         try:
-            await websocket.send_text(json.dumps({"status": "error", "message": str(e)}))
+            await websocket.send_bytes(orjson.dumps({"status": "error", "message": str(e)}))
         except:
-            pass 
+            pass
 
+if __name__ == "__main__":
+    import uvicorn
+    # uvicorn's default "auto" loop/http picks uvloop and httptools when installed (uvicorn[standard])
+    # One worker by default: each worker holds its own model copies (plus its video pool),
+    # and without Redis the rate limiter is per-process, so more workers multiply the limit.
+    default_workers = str(os.cpu_count() or 1) if REDIS_URL else "1"
+    uvicorn.run(
+        "backend.main:app",
+        host=os.getenv("HOST", "127.0.0.1"),
+        port=int(os.getenv("PORT", "8000")),
+        workers=int(os.getenv("WEB_CONCURRENCY", default_workers))
+    )
@@ -1,9 +1,221 @@
-import exifread
 import os
+import io
+import re
+import mmap
+import struct
 import datetime
-from PIL import Image
+from PIL import Image, UnidentifiedImageError
 from PIL.ExifTags import TAGS
 import cv2
+from backend.config import IMAGE_EXTS, VIDEO_EXTS, AUDIO_EXTS
+
+# librosa is a heavy import (~200ms cold); load it once at import, not per audio file
+try:
+    import librosa
+    import audioread
+    _HAS_LIBROSA = True
+    _AUDIO_PROBE_ERRORS = (librosa.util.exceptions.ParameterError, audioread.exceptions.DecodeError)
+except ImportError:
+    _HAS_LIBROSA = False
+    _AUDIO_PROBE_ERRORS = ()
+
+# piexif parses only the EXIF IFDs (no maker-note walking); exifread stays as the fallback
+try:
+    import piexif
+    _HAS_PIEXIF = True
+except ImportError:
+    _HAS_PIEXIF = False
+
+# piexif IFD names -> the group prefixes exifread uses ("Image Software", "EXIF DateTimeOriginal", ...)
+_PIEXIF_GROUPS = {"0th": "Image", "Exif": "EXIF", "GPS": "GPS", "Interop": "Interoperability", "1st": "Thumbnail"}
+
+# Binary stamps left in atoms/headers by generators, editors, devices and platforms,
+# grouped by priority: when several are present, AI beats editing beats hardware/platform.
+AI_SIGS = {
+    # Mainstream AI Chatbots & Consumer Platforms
+    b"ChatGPT": "ChatGPT (OpenAI Generator)", b"OpenAI": "ChatGPT / OpenAI (AI)",
+    b"Gemini": "Google Gemini (AI Generator)", b"SynthID": "Google DeepMind SynthID (Gemini Watermark)",
+    b"Copilot": "Microsoft Copilot (AI)", b"Claude": "Anthropic Claude (AI)",
+    b"Meta AI": "Meta AI Generator", b"DeepMind": "Google DeepMind (AI)",
+    
+    # AI Image Generators & Diffusion Models
+    b"Stable Diffusion": "Stable Diffusion (AI)", b"Midjourney": "Midjourney (AI)",
+    b"DALL": "DALL-E (ChatGPT Image AI)", b"Sora": "OpenAI Sora (Video AI)", b"ComfyUI": "ComfyUI / SD (AI)",
+    b"Automatic1111": "Automatic1111 (AI)", b"Fooocus": "Fooocus (AI)",
+    b"c2pa": "Content Credentials (C2PA AI Tag)", b"JUMBF": "JUMBF Meta (Likely AI)",
+    b"Leonardo": "Leonardo.ai (AI)", b"BingImageBuilder": "Microsoft Bing / Copilot (AI)",
+    b"Grok": "xAI Grok (AI)",
+    
+    # AI Video Generators
+    b"RunwayML": "RunwayML (AI)", b"Runway": "Runway Gen (AI)",
+    b"Pika": "Pika Labs (Video AI)", b"Luma": "Luma Dream Machine (Video AI)",
+    b"Kling": "Kling Video (AI)", b"HeyGen": "HeyGen Avatars (AI)",
+    b"Synthesia": "Synthesia (AI Avatars)",
+    
+    # AI Voice Cloners / TTS
+    b"ElevenLabs": "ElevenLabs (AI Voice)", b"PlayHT": "PlayHT (AI Voice)",
+    b"Suno": "Suno (AI Music/Audio)", b"Udio": "Udio (AI Audio)",
+    b"RVC": "Retrieval-based Voice Conversion (AI Voice)",
+}
+
+EDIT_SIGS = {
+    # Professional & Mobile Editing Tools
+    b"Adobe": "Adobe Creative Cloud", b"Photoshop": "Adobe Photoshop",
+    b"Premiere": "Adobe Premiere", b"FaceApp": "FaceApp (Face Morph)",
+    b"Canva": "Canva App", b"InShot": "InShot Video Editor",
+    b"CapCut": "CapCut", b"Lightroom": "Adobe Lightroom",
+}
+
+HARDWARE_SIGS = {
+    # Standard Original Cameras & Smartphones (REAL / AUTHENTIC Hardware)
+    b"Samsung": "Samsung Galaxy System", b"Pixel": "Google Pixel Smartphone",
+    b"Canon": "Canon EOS / DSLR", b"Nikon": "Nikon DSLR / Z-Series",
+    b"Sony": "Sony Alpha / Cinema Line", b"Panasonic": "Panasonic Lumix",
+    b"Fujifilm": "Fujifilm Digital Camera", b"GoPro": "GoPro Hero Camera",
+    b"DJI": "DJI Drone / Osmo", b"Hasselblad": "Hasselblad Camera",
+    b"Leica": "Leica Camera", b"Motorola": "Motorola Smartphone",
+    b"OnePlus": "OnePlus Smartphone", b"Xiaomi": "Xiaomi / Redmi System",
+    b"Vivo": "Vivo Smartphone", b"Oppo": "Oppo Smartphone", b"Realme": "Realme System",
+    b"Apple": "Apple / iOS", b"iPhone": "Apple iPhone", b"iPad": "Apple iPad",
+    b"Mac OS": "Apple Mac OS", b"Windows": "Windows OS",
+    b"Android": "Android System", b"Google": "Google Platform",
+    b"QuickTime": "Apple QuickTime Core",
+
+    # Standard Social & Messaging Platforms (Typically Real)
+    b"Lavf": "FFmpeg / Transcoder", b"FFmpeg": "FFmpeg / Transcoder",
+    b"WhatsApp": "WhatsApp", b"Instagram": "Instagram",
+    b"Snapchat": "Snapchat", b"Facebook": "Facebook",
+    b"TikTok": "TikTok", b"Telegram": "Telegram", b"Viber": "Viber",
+    b"Discord": "Discord", b"Twitter": "Twitter / X", b"Pinterest": "Pinterest"
+}
+
+# Dict order is the match priority (the earliest entry wins), so the critical AI case exits first
+BINARY_SIGNATURES = {**AI_SIGS, **EDIT_SIGS, **HARDWARE_SIGS}
+
+# Aho-Corasick finds every signature in a single linear pass instead of one
+# `in` scan per signature. Keys are latin-1 text so the standard (unicode)
+# pyahocorasick build can match raw bytes one-to-one.
+try:
+    import ahocorasick
+    _SIGNATURE_AUTOMATON = ahocorasick.Automaton()
+    for _rank, (_sig, _platform_name) in enumerate(BINARY_SIGNATURES.items()):
+        _SIGNATURE_AUTOMATON.add_word(_sig.decode('latin-1'), (_rank, _sig, _platform_name))
+    _SIGNATURE_AUTOMATON.make_automaton()
+except ImportError:
+    _SIGNATURE_AUTOMATON = None
+
+def find_binary_signature(*regions):
+    """
+    Returns the highest-priority (signature, platform_name) present in any of the
+    byte regions, or None. Regions are scanned separately, so no false match can
+    straddle the seam between the head and tail of a file.
+    """
+    if _SIGNATURE_AUTOMATON is None:
+        for sig, platform_name in BINARY_SIGNATURES.items():
+            if any(sig in region for region in regions):
+                return sig, platform_name
+        return None
+
+    best = None
+    for region in regions:
+        for _, entry in _SIGNATURE_AUTOMATON.iter(region.decode('latin-1')):
+            if best is None or entry[0] < best[0]:
+                best = entry
+                if best[0] == 0:
+                    return best[1:]
+    return None if best is None else best[1:]
+
+# Bytes read from each end of the file for EXIF parsing and signature scanning.
+# Image EXIF/JUMBF/text chunks sit at the head, so images use a smaller window
+# than video containers, whose atoms can be anywhere near either end.
+HEAD_TAIL_BYTES = 200000
+IMAGE_HEAD_TAIL_BYTES = 65536
+
+# madvise is Linux/BSD only (Python 3.8+); elsewhere the kernel's default readahead applies
+_CAN_MADVISE = hasattr(mmap.mmap, "madvise") and hasattr(mmap, "MADV_RANDOM")
+
+def read_head_tail(file_path, file_size_bytes, window=HEAD_TAIL_BYTES):
+    """
+    Returns (head, tail): up to `window` bytes from each end of the file.
+    The file is memory-mapped so only the pages covering the two windows are
+    read in; the tail never overlaps the head and is empty for small files.
+    """
+    if file_size_bytes == 0:
+        return b"", b""
+    chunk_size = min(window, file_size_bytes)
+    tail_start = max(chunk_size, file_size_bytes - chunk_size)
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if _CAN_MADVISE:
+            # No readahead across the (possibly multi-GB) middle of the file; prefetch just the two windows
+            mm.madvise(mmap.MADV_RANDOM)
+            mm.madvise(mmap.MADV_WILLNEED, 0, chunk_size)
+            if tail_start < file_size_bytes:
+                aligned = tail_start - tail_start % mmap.PAGESIZE
+                mm.madvise(mmap.MADV_WILLNEED, aligned, file_size_bytes - aligned)
+        head = mm[:chunk_size]
+        tail = mm[tail_start:]
+    return head, tail
+
+def _piexif_tags(data):
+    """
+    Parses EXIF with piexif and returns a dict keyed like exifread's output.
+    ASCII values are decoded to str; other values are kept as parsed.
+    """
+    exif_dict = piexif.load(data)
+    tags = {}
+    for ifd, group in _PIEXIF_GROUPS.items():
+        names = piexif.TAGS[ifd]
+        for tag_id, value in (exif_dict.get(ifd) or {}).items():
+            name = names.get(tag_id, {}).get("name", f"Tag 0x{tag_id:04X}")
+            if isinstance(value, bytes):
+                value = value.rstrip(b"\x00").decode("utf-8", "replace").strip()
+            tags[f"{group} {name}"] = value
+    return tags
+
+def read_exif_tags(head, file_path, ext, file_size_bytes):
+    """
+    Returns the file's EXIF tags keyed like exifread ("Image Make", "GPS GPSLatitude", ...).
+    JPEG EXIF is parsed with piexif from the head bytes; anything piexif cannot
+    read (PNG, containers, malformed data) falls back to exifread.
+    """
+    if _HAS_PIEXIF and head.startswith(b"\xff\xd8"):
+        try:
+            return _piexif_tags(head)
+        except (piexif.InvalidImageDataError, ValueError, struct.error):
+            pass
+    
+    # exifread walks every IFD in pure Python; it is only imported once a file needs the fallback
+    import exifread
+    
+    # JPEG EXIF lives in the APP1 segment at the head
+    tags = exifread.process_file(io.BytesIO(head), details=False)
+    if not tags and ext == '.png' and file_size_bytes > len(head):
+        # PNG may carry its eXIf chunk after the image data, beyond the head window
+        with open(file_path, 'rb') as f:
+            tags = exifread.process_file(f, details=False)
+    return tags
+
+# Editing/generator keywords in the EXIF Software tag, matched case-insensitively as substrings
+SUSPICIOUS_SOFTWARE_KEYWORDS = (
+    "Adobe", "Photoshop", "GIMP", "Edit", "Synthetic", "AI", "Generative", 
+    "Stable Diffusion", "Midjourney", "DALL-E", "Canva", "InShot", "FaceApp"
+)
+_SOFTWARE_RE = re.compile("|".join(map(re.escape, SUSPICIOUS_SOFTWARE_KEYWORDS)), re.IGNORECASE)
+
+# Generator names written into PNG text chunks (e.g. the Stable Diffusion "parameters" chunk).
+# "DALL" must be followed by an optional separator and "E" so names like "Kendall" don't match.
+_AI_PNG_RE = re.compile(r"Stable Diffusion|Midjourney|DALL[\W_]?E|ComfyUI|Automatic1111|Leonardo", re.IGNORECASE)
+
+def _jpeg_quant_score(table_count):
+    """
+    Scores a JPEG by its number of DQT tables for compression artifacts.
+    Returns (score_delta, risk_flag or None).
+    """
+    if table_count == 0:
+        return 0.20, "Suspicious Compression Pattern: Missing Quantization Tables (Non-standard JPEG)"
+    if table_count < 2:
+        return 0.15, "Suspicious Compression Pattern: Unified Luma/Chroma Tables (AI Artifact)"
+    return 0.0, None
 
 def check_metadata(file_path):
     score = 0.0 # Start with low suspicion (Real)
@@ -12,10 +224,11 @@ def check_metadata(file_path):
     file_size_mb = round(file_size_bytes / (1024 * 1024), 2)
     try:
         created_time = datetime.datetime.fromtimestamp(os.path.getctime(file_path)).strftime('%Y-%m-%d %H:%M:%S')
-    except:
+    except (OSError, ValueError, OverflowError):
         created_time = "Unknown"
         
-    file_format = os.path.splitext(file_path)[1].upper().replace(".", "")
+    ext = os.path.splitext(file_path)[1].lower()
+    file_format = ext.upper().replace(".", "")
     
     metadata_analysis = {
         "format": file_format,
@@ -31,8 +244,9 @@ def check_metadata(file_path):
     }
     
     # Try to extract actual Media Capabilities
+    pil_format = None
     try:
-        if file_path.lower().endswith(('.mp4', '.avi', '.mov')):
+        if ext in VIDEO_EXTS:
             cap = cv2.VideoCapture(file_path)
             if cap.isOpened():
                 width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
@@ -44,32 +258,37 @@ def check_metadata(file_path):
                 if fps > 0 and frame_count > 0:
                     metadata_analysis["duration"] = f"{round(frame_count / fps, 2)} secs"
             cap.release()
-        elif file_path.lower().endswith(('.wav', '.mp3', '.ogg', '.flac')):
-            import librosa
+        elif ext in AUDIO_EXTS and _HAS_LIBROSA:
             duration_sec = librosa.get_duration(path=file_path)
             metadata_analysis["duration"] = f"{round(duration_sec, 2)} secs"
-        elif file_path.lower().endswith(('.jpg', '.png', '.jpeg')):
+        elif ext in IMAGE_EXTS:
+            # Single header parse: keep the compression cues for the Pillow analysis below
             with Image.open(file_path) as img:
                 metadata_analysis["resolution"] = f"{img.width} x {img.height} px"
-    except Exception as e:
+                pil_quantization = getattr(img, 'quantization', None)
+                pil_info = img.info
+                pil_text = img.text if img.format == 'PNG' else {}
+                pil_format = img.format
+    except (cv2.error, RuntimeError, OSError, ValueError, UnidentifiedImageError,
+            Image.DecompressionBombError, *_AUDIO_PROBE_ERRORS) as e:
+        # cv2 probe failures, unreadable/unidentified files, oversized (decompression bomb) images
+        # and librosa decode errors
         print("Media characteristic extraction error:", e)
     
     try:
-        # A. Use ExifRead for detailed tag extraction
-        with open(file_path, 'rb') as f:
-            tags = exifread.process_file(f, details=False)
+        # Read the head and tail once; the EXIF parse and the binary signature scan share them.
+        window = IMAGE_HEAD_TAIL_BYTES if ext in IMAGE_EXTS else HEAD_TAIL_BYTES
+        head, tail = read_head_tail(file_path, file_size_bytes, window)
+        
+        # A. Detailed tag extraction (piexif, with ExifRead as the fallback)
+        tags = read_exif_tags(head, file_path, ext, file_size_bytes)
 
         # 1. Software / Platform Analysis
         software_tag = str(tags.get('Image Software', ''))
         metadata_analysis['software'] = software_tag if software_tag else "Unknown / Stripped"
         
-        suspicious_keywords = [
-            "Adobe", "Photoshop", "GIMP", "Edit", "Synthetic", "AI", "Generative", 
-            "Stable Diffusion", "Midjourney", "DALL-E", "Canva", "InShot", "FaceApp"
-        ]
-        
         if software_tag:
-            if any(keyword.lower() in software_tag.lower() for keyword in suspicious_keywords):
+            if _SOFTWARE_RE.search(software_tag):
                 score += 0.4
                 metadata_analysis['software'] = f"{software_tag} (EDITING DETECTED)"
                 metadata_analysis['risk_flags'].append(f"Editing Software Detected: {software_tag}")
@@ -77,120 +296,58 @@ def check_metadata(file_path):
             # Deep Binary Signature Scanning (If standard EXIF is stripped)
             # Many platforms strip EXIF but leave binary stamps in the atoms/headers.
             try:
-                with open(file_path, 'rb') as bin_file:
-                    f_size = os.path.getsize(file_path)
-                    chunk_size = min(200000, f_size)
-                    raw_bytes = bin_file.read(chunk_size)
-                    if f_size > chunk_size:
-                        bin_file.seek(-chunk_size, os.SEEK_END)
-                        raw_bytes += bin_file.read()
-                        
-                    signatures = {
-                        # Mainstream AI Chatbots & Consumer Platforms
-                        b"ChatGPT": "ChatGPT (OpenAI Generator)", b"OpenAI": "ChatGPT / OpenAI (AI)",
-                        b"Gemini": "Google Gemini (AI Generator)", b"SynthID": "Google DeepMind SynthID (Gemini Watermark)",
-                        b"Copilot": "Microsoft Copilot (AI)", b"Claude": "Anthropic Claude (AI)",
-                        b"Meta AI": "Meta AI Generator", b"DeepMind": "Google DeepMind (AI)",
-                        
-                        # AI Image Generators & Diffusion Models
-                        b"Stable Diffusion": "Stable Diffusion (AI)", b"Midjourney": "Midjourney (AI)",
-                        b"DALL": "DALL-E (ChatGPT Image AI)", b"Sora": "OpenAI Sora (Video AI)", b"ComfyUI": "ComfyUI / SD (AI)",
-                        b"Automatic1111": "Automatic1111 (AI)", b"Fooocus": "Fooocus (AI)",
-                        b"c2pa": "Content Credentials (C2PA AI Tag)", b"JUMBF": "JUMBF Meta (Likely AI)",
-                        b"Leonardo": "Leonardo.ai (AI)", b"BingImageBuilder": "Microsoft Bing / Copilot (AI)",
-                        b"Grok": "xAI Grok (AI)",
-                        
-                        # AI Video Generators
-                        b"RunwayML": "RunwayML (AI)", b"Runway": "Runway Gen (AI)",
-                        b"Pika": "Pika Labs (Video AI)", b"Luma": "Luma Dream Machine (Video AI)",
-                        b"Kling": "Kling Video (AI)", b"HeyGen": "HeyGen Avatars (AI)",
-                        b"Synthesia": "Synthesia (AI Avatars)",
+                found_sig = False
+                match = find_binary_signature(head, tail)
+                if match is not None:
+                    platform_name = match[1]
+                    metadata_analysis['software'] = f"{platform_name} (Deep Binary Scan)"
+                    if "(AI" in platform_name or "FaceApp" in platform_name:
+                        score += 0.9  # Direct AI signature is an immediate Critical Flag
+                        metadata_analysis['risk_flags'].append(f"CRITICAL: {platform_name} Engine Signature Detected")
+                    elif "Adobe" in platform_name:
+                        score += 0.05
+                        metadata_analysis['risk_flags'].append(f"Professional Editing Software Detected: {platform_name} (Not Inherently Malicious)")
+                    found_sig = True
                         
-                        # AI Voice Cloners / TTS
-                        b"ElevenLabs": "ElevenLabs (AI Voice)", b"PlayHT": "PlayHT (AI Voice)",
-                        b"Suno": "Suno (AI Music/Audio)", b"Udio": "Udio (AI Audio)",
-                        b"RVC": "Retrieval-based Voice Conversion (AI Voice)",
-                        
-                        # Professional & Mobile Editing Tools
-                        b"Adobe": "Adobe Creative Cloud", b"Photoshop": "Adobe Photoshop",
-                        b"Premiere": "Adobe Premiere", b"FaceApp": "FaceApp (Face Morph)",
-                        b"Canva": "Canva App", b"InShot": "InShot Video Editor",
-                        b"CapCut": "CapCut", b"Lightroom": "Adobe Lightroom",
-                        
-                        # Standard Original Cameras & Smartphones (REAL / AUTHENTIC Hardware)
-                        b"Samsung": "Samsung Galaxy System", b"Pixel": "Google Pixel Smartphone",
-                        b"Canon": "Canon EOS / DSLR", b"Nikon": "Nikon DSLR / Z-Series",
-                        b"Sony": "Sony Alpha / Cinema Line", b"Panasonic": "Panasonic Lumix",
-                        b"Fujifilm": "Fujifilm Digital Camera", b"GoPro": "GoPro Hero Camera",
-                        b"DJI": "DJI Drone / Osmo", b"Hasselblad": "Hasselblad Camera",
-                        b"Leica": "Leica Camera", b"Motorola": "Motorola Smartphone",
-                        b"OnePlus": "OnePlus Smartphone", b"Xiaomi": "Xiaomi / Redmi System",
-                        b"Vivo": "Vivo Smartphone", b"Oppo": "Oppo Smartphone", b"Realme": "Realme System",
-                        b"Apple": "Apple / iOS", b"iPhone": "Apple iPhone", b"iPad": "Apple iPad",
-                        b"Mac OS": "Apple Mac OS", b"Windows": "Windows OS",
-                        b"Android": "Android System", b"Google": "Google Platform",
-                        b"QuickTime": "Apple QuickTime Core",
-
-                        # Standard Social & Messaging Platforms (Typically Real)
-                        b"Lavf": "FFmpeg / Transcoder", b"FFmpeg": "FFmpeg / Transcoder",
-                        b"WhatsApp": "WhatsApp", b"Instagram": "Instagram",
-                        b"Snapchat": "Snapchat", b"Facebook": "Facebook",
-                        b"TikTok": "TikTok", b"Telegram": "Telegram", b"Viber": "Viber",
-                        b"Discord": "Discord", b"Twitter": "Twitter / X", b"Pinterest": "Pinterest"
-                    }
+                if not found_sig:
+                    # -----------------------------------------------------------------
+                    # 🤖 AI HEURISTIC PLATFORM PREDICTION
+                    # If the file is 100% stripped, we use ML-inspired heuristics
+                    # based on compression, aspect ratio, and format to guess the source!
+                    # -----------------------------------------------------------------
+                    guessed_platform = "Unknown Source"
+                    res = metadata_analysis.get('resolution', '')
+                    fmt = metadata_analysis.get('format', '').upper()
+                    size = file_size_mb
                     
-                    found_sig = False
-                    for sig, platform_name in signatures.items():
-                        if sig in raw_bytes:
-                            metadata_analysis['software'] = f"{platform_name} (Deep Binary Scan)"
-                            if "(AI" in platform_name or "FaceApp" in platform_name:
-                                score += 0.9  # Direct AI signature is an immediate Critical Flag
-                                metadata_analysis['risk_flags'].append(f"CRITICAL: {platform_name} Engine Signature Detected")
-                            elif "Adobe" in platform_name:
-                                score += 0.05
-                                metadata_analysis['risk_flags'].append(f"Professional Editing Software Detected: {platform_name} (Not Inherently Malicious)")
-                            found_sig = True
-                            break
-                            
-                    if not found_sig:
-                        # -----------------------------------------------------------------
-                        # 🤖 AI HEURISTIC PLATFORM PREDICTION
-                        # If the file is 100% stripped, we use ML-inspired heuristics
-                        # based on compression, aspect ratio, and format to guess the source!
-                        # -----------------------------------------------------------------
-                        guessed_platform = "Unknown Source"
-                        res = metadata_analysis.get('resolution', '')
-                        fmt = metadata_analysis.get('format', '').upper()
-                        size = file_size_mb
-                        
-                        if fmt in ['MP4', 'MOV']:
-                            if '1080 x 1920' in res or '720 x 1280' in res:
-                                guessed_platform = "TikTok / Reels (Mobile Vertical)"
-                            elif '1920 x 1080' in res:
-                                guessed_platform = "YouTube / DSLR (Standard HD)"
-                            elif size < 16.0:  # WhatsApp video limit is normally 16MB
-                                guessed_platform = "WhatsApp Video (Compressed)"
-                        elif fmt in ['JPG', 'JPEG']:
-                            if '1080 x 1350' in res or '1080 x 1080' in res:
-                                guessed_platform = "Instagram Photo (Standard Square/Portrait)"
-                            elif size < 0.5:
-                                guessed_platform = "WhatsApp Deep-compressed Image"
-                            else:
-                                guessed_platform = "Web Download / Untracked"
-                        elif fmt in ['PNG']:
-                            if size > 1.0 and ('512 x 512' in res or '1024 x 1024' in res):
-                                guessed_platform = "AI Generator (Midjourney/DALL-E)"
-                                score += 0.85
-                                metadata_analysis['risk_flags'].append("High Quality PNG with Diffusion Dimensions")
-                            else:
-                                guessed_platform = "Screen Capture / Web Graphic"
-                        elif fmt in ['WAV', 'MP3']:
-                            if size < 2.0:
-                                guessed_platform = "Voice Note (WhatsApp/Telegram)"
-                            else:
-                                guessed_platform = "Studio / Podcast Recording"
-                        
-                        metadata_analysis['software'] = f"{guessed_platform} (Heuristic Prediction)"
+                    if fmt in ['MP4', 'MOV']:
+                        if '1080 x 1920' in res or '720 x 1280' in res:
+                            guessed_platform = "TikTok / Reels (Mobile Vertical)"
+                        elif '1920 x 1080' in res:
+                            guessed_platform = "YouTube / DSLR (Standard HD)"
+                        elif size < 16.0:  # WhatsApp video limit is normally 16MB
+                            guessed_platform = "WhatsApp Video (Compressed)"
+                    elif fmt in ['JPG', 'JPEG']:
+                        if '1080 x 1350' in res or '1080 x 1080' in res:
+                            guessed_platform = "Instagram Photo (Standard Square/Portrait)"
+                        elif size < 0.5:
+                            guessed_platform = "WhatsApp Deep-compressed Image"
+                        else:
+                            guessed_platform = "Web Download / Untracked"
+                    elif fmt in ['PNG']:
+                        if size > 1.0 and ('512 x 512' in res or '1024 x 1024' in res):
+                            guessed_platform = "AI Generator (Midjourney/DALL-E)"
+                            score += 0.85
+                            metadata_analysis['risk_flags'].append("High Quality PNG with Diffusion Dimensions")
+                        else:
+                            guessed_platform = "Screen Capture / Web Graphic"
+                    elif fmt in ['WAV', 'MP3']:
+                        if size < 2.0:
+                            guessed_platform = "Voice Note (WhatsApp/Telegram)"
+                        else:
+                            guessed_platform = "Studio / Podcast Recording"
+                    
+                    metadata_analysis['software'] = f"{guessed_platform} (Heuristic Prediction)"
             except Exception:
                 metadata_analysis['software'] = "Unknown Source (Corrupted/Stripped)"
 
@@ -222,29 +379,23 @@ def check_metadata(file_path):
             metadata_analysis['gps'] = "Location Data Present (Authenticity Indicator)"
             score -= 0.15 # Strong signal of organic capture
         
-        # 5. Pillow Analysis for Compression cues
-        try:
-            with Image.open(file_path) as img:
-                if img.format == 'JPEG':
-                    if not img.quantization:
-                        metadata_analysis['risk_flags'].append("Suspicious Compression Pattern: Missing Quantization Tables (Non-standard JPEG)")
-                        score += 0.20
-                    elif len(img.quantization) < 2:
-                        metadata_analysis['risk_flags'].append("Suspicious Compression Pattern: Unified Luma/Chroma Tables (AI Artifact)")
-                        score += 0.15
-                    
-                    if 'adobe' in img.info:
-                        score += 0.0
-                        metadata_analysis['risk_flags'].append("Adobe Editing Software (Photoshop/Lightroom) Detected")
-                        
-                if img.format == 'PNG':
-                   text_chunks = img.text
-                   if 'parameters' in text_chunks or 'Software' in text_chunks.get('Software', ''):
-                       if 'Stable Diffusion' in str(text_chunks) or 'Midjourney' in str(text_chunks):
-                           score += 0.8
-                           metadata_analysis['risk_flags'].append("AI Diffusion Metadata Found")
-        except Exception:
-            pass 
+        # 5. Pillow Analysis for Compression cues (captured during the header parse above)
+        if pil_format == 'JPEG':
+            quant_score, quant_flag = _jpeg_quant_score(len(pil_quantization or {}))
+            if quant_flag:
+                metadata_analysis['risk_flags'].append(quant_flag)
+                score += quant_score
+            
+            if 'adobe' in pil_info:
+                score += 0.0
+                metadata_analysis['risk_flags'].append("Adobe Editing Software (Photoshop/Lightroom) Detected")
+                
+        if pil_format == 'PNG':
+            text_chunks = pil_text
+            if 'parameters' in text_chunks or 'Software' in text_chunks.get('Software', ''):
+                if any(_AI_PNG_RE.search(str(value)) for value in text_chunks.values()):
+                    score += 0.8
+                    metadata_analysis['risk_flags'].append("AI Diffusion Metadata Found")
 
         # 6. Anomaly Detection
         if len(tags) < 3 and score < 0.2:
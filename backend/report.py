@@ -4,36 +4,78 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, HRFlowable
 import json
+import multiprocessing as mp
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from types import SimpleNamespace
 
-def generate_pdf_report(scan_data, output_path):
+# Styles are immutable descriptors, so they are built once at import and shared by every report
+_STYLES = getSampleStyleSheet()
+
+# Custom Styles for TruthGuard Brand
+_TITLE_STYLE = ParagraphStyle('Title', parent=_STYLES['Heading1'], fontSize=28, textColor=colors.HexColor("#0A84FF"), spaceAfter=5, alignment=1, fontName="Helvetica-Bold")
+_SUBTITLE_STYLE = ParagraphStyle('Subtitle', parent=_STYLES['Normal'], fontSize=12, textColor=colors.HexColor("#64748b"), spaceAfter=30, alignment=1)
+
+_H2_STYLE = ParagraphStyle('Heading2', parent=_STYLES['Heading2'], fontSize=16, textColor=colors.HexColor("#0f172a"), spaceBefore=20, spaceAfter=10, fontName="Helvetica-Bold")
+_H3_STYLE = ParagraphStyle('Heading3', parent=_STYLES['Heading3'], fontSize=13, textColor=colors.HexColor("#334155"), spaceBefore=15, spaceAfter=8, fontName="Helvetica-Bold")
+
+_NORMAL_STYLE = ParagraphStyle('NormalText', parent=_STYLES['Normal'], fontSize=11, textColor=colors.HexColor("#334155"), leading=16)
+_BOLD_STYLE = ParagraphStyle('BoldText', parent=_NORMAL_STYLE, fontName="Helvetica-Bold")
+
+_ALERT_STYLE = ParagraphStyle('AlertText', parent=_NORMAL_STYLE, textColor=colors.HexColor("#ef4444"))
+_SUCCESS_STYLE = ParagraphStyle('SuccessText', parent=_NORMAL_STYLE, textColor=colors.HexColor("#10b981"))
+_SMALL_STYLE = ParagraphStyle('Small', parent=_NORMAL_STYLE, fontSize=8, textColor=colors.HexColor("#64748b"))
+
+_VERDICT_COLORS = {"FAKE": colors.HexColor("#ef4444"), "REAL": colors.HexColor("#10b981")}
+
+_EXEC_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,-1), colors.HexColor("#f8fafc")),
+    ('TEXTCOLOR', (0,0), (-1,-1), colors.HexColor("#1e293b")),
+    ('ALIGN', (0,0), (-1,-1), 'LEFT'),
+    ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+    ('FONTNAME', (0,0), (-1,-1), 'Helvetica-Bold'),
+    ('FONTNAME', (1,0), (1,-1), 'Helvetica'),
+    ('FONTNAME', (3,0), (3,-1), 'Helvetica'),
+    ('FONTSIZE', (0,0), (-1,-1), 10),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 10),
+    ('TOPPADDING', (0,0), (-1,-1), 10),
+    ('GRID', (0,0), (-1,-1), 0.5, colors.HexColor("#cbd5e1"))
+])
+
+_COMPONENT_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#0f172a")),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
+    ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+    ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('BOTTOMPADDING', (0,0), (-1,0), 12),
+    ('TOPPADDING', (0,0), (-1,0), 12),
+    ('BACKGROUND', (0,1), (-1,-1), colors.HexColor("#f1f5f9")),
+    ('GRID', (0,0), (-1,-1), 1, colors.white),
+    ('LINEBELOW', (0,0), (-1,-1), 0.5, colors.HexColor("#cbd5e1"))
+])
+
+@lru_cache(maxsize=256)
+def _pretty_key(key):
+    """Turns a report dict key such as 'lsb_variance' into the label 'Lsb variance'."""
+    return str(key).replace('_', ' ').capitalize()
+
+def generate_pdf_report(scan_data, output):
     """
     Generates a professional forensic PDF report using reportlab.
     scan_data is the SQLAlchemy model instance representing the scan.
+    output may be a file path or a writable binary file-like object (e.g. io.BytesIO).
     """
-    doc = SimpleDocTemplate(output_path, pagesize=letter,
+    doc = SimpleDocTemplate(output, pagesize=letter,
                             rightMargin=40, leftMargin=40,
                             topMargin=40, bottomMargin=40)
     
-    styles = getSampleStyleSheet()
-    
-    # Custom Styles for TruthGuard Brand
-    title_style = ParagraphStyle('Title', parent=styles['Heading1'], fontSize=28, textColor=colors.HexColor("#0A84FF"), spaceAfter=5, alignment=1, fontName="Helvetica-Bold")
-    subtitle_style = ParagraphStyle('Subtitle', parent=styles['Normal'], fontSize=12, textColor=colors.HexColor("#64748b"), spaceAfter=30, alignment=1)
-    
-    h2_style = ParagraphStyle('Heading2', parent=styles['Heading2'], fontSize=16, textColor=colors.HexColor("#0f172a"), spaceBefore=20, spaceAfter=10, fontName="Helvetica-Bold")
-    h3_style = ParagraphStyle('Heading3', parent=styles['Heading3'], fontSize=13, textColor=colors.HexColor("#334155"), spaceBefore=15, spaceAfter=8, fontName="Helvetica-Bold")
-    
-    normal_style = ParagraphStyle('NormalText', parent=styles['Normal'], fontSize=11, textColor=colors.HexColor("#334155"), leading=16)
-    bold_style = ParagraphStyle('BoldText', parent=normal_style, fontName="Helvetica-Bold")
-    
-    alert_style = ParagraphStyle('AlertText', parent=normal_style, textColor=colors.HexColor("#ef4444"))
-    success_style = ParagraphStyle('SuccessText', parent=normal_style, textColor=colors.HexColor("#10b981"))
-
     elements = []
     
     # ================= HEADERS =================
-    elements.append(Paragraph("<b>TRUTHGUARD AI</b>", title_style))
-    elements.append(Paragraph("OFFICIAL FORENSIC ANALYSIS REPORT", subtitle_style))
+    elements.append(Paragraph("<b>TRUTHGUARD AI</b>", _TITLE_STYLE))
+    elements.append(Paragraph("OFFICIAL FORENSIC ANALYSIS REPORT", _SUBTITLE_STYLE))
     elements.append(HRFlowable(width="100%", thickness=2, color=colors.HexColor("#0A84FF"), spaceAfter=20, spaceBefore=0))
     
     # Load detailed JSON from db
@@ -43,41 +85,29 @@ def generate_pdf_report(scan_data, output_path):
         details = {}
 
     # ================= EXECUTIVE SUMMARY =================
-    verdict_color = colors.HexColor("#ef4444") if scan_data.verdict == "FAKE" else colors.HexColor("#10b981")
+    verdict_color = _VERDICT_COLORS["FAKE" if scan_data.verdict == "FAKE" else "REAL"]
     probability_str = f"{int(scan_data.fake_probability * 100)}%"
     
     exec_data = [
         ["REPORT IDENTIFIER:", scan_data.scan_id, "DATE OF ANALYSIS:", scan_data.timestamp.strftime("%Y-%m-%d %H:%M:%S UTC")],
         ["TARGET MEDIA:", scan_data.filename, "PROCESSING TIME:", details.get('processing_time', 'N/A')],
-        ["MANIPULATION PROB:", Paragraph(f"<b>{probability_str}</b>", normal_style), "FINAL VERDICT:", Paragraph(f"<b><font color='{verdict_color}' size='12'>{scan_data.verdict}</font></b>", normal_style)]
+        ["MANIPULATION PROB:", Paragraph(f"<b>{probability_str}</b>", _NORMAL_STYLE), "FINAL VERDICT:", Paragraph(f"<b><font color='{verdict_color}' size='12'>{scan_data.verdict}</font></b>", _NORMAL_STYLE)]
     ]
     
     exec_table = Table(exec_data, colWidths=[130, 150, 130, 110])
-    exec_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,-1), colors.HexColor("#f8fafc")),
-        ('TEXTCOLOR', (0,0), (-1,-1), colors.HexColor("#1e293b")),
-        ('ALIGN', (0,0), (-1,-1), 'LEFT'),
-        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-        ('FONTNAME', (0,0), (-1,-1), 'Helvetica-Bold'),
-        ('FONTNAME', (1,0), (1,-1), 'Helvetica'),
-        ('FONTNAME', (3,0), (3,-1), 'Helvetica'),
-        ('FONTSIZE', (0,0), (-1,-1), 10),
-        ('BOTTOMPADDING', (0,0), (-1,-1), 10),
-        ('TOPPADDING', (0,0), (-1,-1), 10),
-        ('GRID', (0,0), (-1,-1), 0.5, colors.HexColor("#cbd5e1"))
-    ]))
+    exec_table.setStyle(_EXEC_TABLE_STYLE)
     
     elements.append(exec_table)
     elements.append(Spacer(1, 20))
     
     # ================= CONCLUSION =================
-    elements.append(Paragraph("EXECUTIVE CONCLUSION", h2_style))
+    elements.append(Paragraph("EXECUTIVE CONCLUSION", _H2_STYLE))
     explanation = details.get("explanation", "No detailed explanation available.")
-    elements.append(Paragraph(explanation, normal_style))
+    elements.append(Paragraph(explanation, _NORMAL_STYLE))
     elements.append(Spacer(1, 15))
 
     # ================= INTEGRITY BREAKDOWN =================
-    elements.append(Paragraph("COMPONENT INTEGRITY SCORES", h2_style))
+    elements.append(Paragraph("COMPONENT INTEGRITY SCORES", _H2_STYLE))
     
     component_data = [["MEDIA COMPONENT", "REALNESS CONFIDENCE", "STATUS"]]
     comps = details.get("components", {})
@@ -106,49 +136,45 @@ def generate_pdf_report(scan_data, output_path):
         component_data.append([
             comp_name.upper(), 
             val_str, 
-            Paragraph(f"<b><font color='{status_color}'>{status}</font></b>", normal_style)
+            Paragraph(f"<b><font color='{status_color}'>{status}</font></b>", _NORMAL_STYLE)
         ])
         
     comp_table = Table(component_data, colWidths=[173, 173, 174])
-    comp_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#0f172a")),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0,0), (-1,0), 12),
-        ('TOPPADDING', (0,0), (-1,0), 12),
-        ('BACKGROUND', (0,1), (-1,-1), colors.HexColor("#f1f5f9")),
-        ('GRID', (0,0), (-1,-1), 1, colors.white),
-        ('LINEBELOW', (0,0), (-1,-1), 0.5, colors.HexColor("#cbd5e1"))
-    ]))
+    comp_table.setStyle(_COMPONENT_TABLE_STYLE)
     
     elements.append(comp_table)
     elements.append(Spacer(1, 20))
 
     # ================= DETAILED FORENSIC FINDINGS =================
-    elements.append(Paragraph("DETAILED FORENSIC MODULE FINDINGS", h2_style))
+    elements.append(Paragraph("DETAILED FORENSIC MODULE FINDINGS", _H2_STYLE))
     checks = details.get("checks", {})
     
     for check_key, check_data in checks.items():
         title = f"{check_key.upper()} ANALYSIS"
         passed = check_data.get("pass", False)
-        status_text = "PASS (Authentic)" if passed else "FAIL (Synthetic/Manipulated)"
-        status_style = success_style if passed else alert_style
+        if passed is None:
+            # Module did not run (short-circuited by a conclusive signal elsewhere)
+            status_text = "SKIPPED"
+            status_style = _NORMAL_STYLE
+        else:
+            status_text = "PASS (Authentic)" if passed else "FAIL (Synthetic/Manipulated)"
+            status_style = _SUCCESS_STYLE if passed else _ALERT_STYLE
         
-        elements.append(Paragraph(title, h3_style))
-        elements.append(Paragraph(f"<b>Status:</b> <font color='{status_style.textColor}'>{status_text}</font>", normal_style))
-        elements.append(Paragraph(f"<b>Detail:</b> {check_data.get('detail', 'N/A')}", normal_style))
+        elements.append(Paragraph(title, _H3_STYLE))
+        elements.append(Paragraph(f"<b>Status:</b> <font color='{status_style.textColor}'>{status_text}</font>", _NORMAL_STYLE))
+        elements.append(Paragraph(f"<b>Detail:</b> {check_data.get('detail', 'N/A')}", _NORMAL_STYLE))
         
         report_data = check_data.get('report', {})
         if report_data:
-            report_str = []
-            for k, v in report_data.items():
-                if isinstance(v, (list, dict)): continue  # Skip complex objects
-                report_str.append(f"<b>{str(k).replace('_', ' ').capitalize()}:</b> {v}")
+            # Skip complex objects; key labels come from the shared _pretty_key cache
+            report_str = " | ".join(
+                f"<b>{_pretty_key(k)}:</b> {v}"
+                for k, v in report_data.items()
+                if not isinstance(v, (list, dict))
+            )
             
             if report_str:
-                elements.append(Paragraph(" | ".join(report_str), normal_style))
+                elements.append(Paragraph(report_str, _NORMAL_STYLE))
         
         elements.append(Spacer(1, 10))
         
@@ -157,9 +183,41 @@ def generate_pdf_report(scan_data, output_path):
     # ================= DISCLAIMER =================
     elements.append(HRFlowable(width="100%", thickness=1, color=colors.HexColor("#cbd5e1"), spaceAfter=15))
     disclaimer = "This report was generated automatically by TruthGuard AI. While the models utilize state-of-the-art multimodal deep learning fusion (CNN boundaries, ELA artifacts, Audio Spectra analysis), results are probabilistic and should not be used as the sole basis for critical legal or journalistic decisions without human expert validation."
-    elements.append(Paragraph(f"<i>Disclaimer: {disclaimer}</i>", ParagraphStyle('Small', parent=normal_style, fontSize=8, textColor=colors.HexColor("#64748b"))))
+    elements.append(Paragraph(f"<i>Disclaimer: {disclaimer}</i>", _SMALL_STYLE))
     
     # Build Document
     doc.build(elements)
     
-    return output_path
+    return output
+
+def _report_snapshot(scan_data):
+    """Copies the fields a report needs into a plain, picklable object (safe to send to worker processes)."""
+    return SimpleNamespace(
+        scan_id=scan_data.scan_id,
+        filename=scan_data.filename,
+        timestamp=scan_data.timestamp,
+        verdict=scan_data.verdict,
+        fake_probability=scan_data.fake_probability,
+        details_json=scan_data.details_json
+    )
+
+def _render_report_to_dir(scan, output_dir):
+    report_path = os.path.join(output_dir, f"TruthGuard_Report_{scan.scan_id}.pdf")
+    generate_pdf_report(scan, report_path)
+    return report_path
+
+def generate_pdf_reports(scans, output_dir, max_workers=None):
+    """
+    Bulk export: renders one PDF per scan into output_dir and returns the paths in input order.
+    All reports share the module-level styles; with max_workers > 1 the builds are
+    spread across spawned worker processes, since reportlab layout is CPU-bound Python.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    snapshots = [_report_snapshot(scan) for scan in scans]
+    
+    if not max_workers or max_workers <= 1 or len(snapshots) < 2:
+        return [_render_report_to_dir(scan, output_dir) for scan in snapshots]
+    
+    # Spawn, not fork: the API process holds cv2/torch thread pools and locks a forked child could deadlock on
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp.get_context("spawn")) as pool:
+        return list(pool.map(_render_report_to_dir, snapshots, repeat(output_dir)))
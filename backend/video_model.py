@@ -1,69 +1,374 @@
 import cv2
 import numpy as np
-import tempfile
-import os
-from backend.image_model import detect_fake_image
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from backend.image_model import detect_fake_image_batch
 from backend.facial_analysis import analyze_facial_landmarks
 from backend.lipsync import detect_lipsync_mismatch
 
-def detect_fake_video(video_path):
+logger = logging.getLogger("truthguard.video")
+
+# Numba fuses the per-step magnitude + variance into one pass over the flow field;
+# cv2.magnitude + cv2.meanStdDev is the fallback when it is not installed.
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+if _HAS_NUMBA:
+    @njit(fastmath=True, cache=True)
+    def _flow_magnitude_variance_jit(flow):
+        h, w, _ = flow.shape
+        total = 0.0
+        total_sq = 0.0
+        for y in range(h):
+            for x in range(w):
+                fx = flow[y, x, 0]
+                fy = flow[y, x, 1]
+                m2 = fx * fx + fy * fy
+                total += np.sqrt(m2)
+                total_sq += m2
+        n = h * w
+        mean = total / n
+        return total_sq / n - mean * mean
+
+    # Pay the JIT cost at import (or load it from the on-disk cache), not on the first video
+    _flow_magnitude_variance_jit(np.zeros((2, 2, 2), dtype=np.float32))
+
+def _magnitude_variance(mag):
+    """Population variance of a magnitude map, in one native pass."""
+    _, mag_std = cv2.meanStdDev(mag)
+    return float(mag_std[0, 0]) ** 2
+
+def flow_magnitude_variance(flow):
     """
-    Comprehensive video analysis pipeline.
-    
-    Stages:
-    1. Visual Artifact Detection: Samples frames and checks for GAN noise/artifacts.
-    2. Facial Biometrics: Tracks blinking and geometric consistency.
-    3. Lip-Sync Analysis: Checks correlation between audio and visual lip movements.
-    
-    Optimizations:
-    - Frame Sampling: 1 frame/sec to reduce load.
-    - Early Exit: Stops after 10 seconds of analysis.
-    - Downscaling: Resizes large frames to 640px max width.
+    Variance of the per-pixel displacement magnitude of an HxWx2 float32 flow field
+    (the per-step jitter statistic), without materializing the magnitude map under numba.
+    """
+    if _HAS_NUMBA:
+        return float(_flow_magnitude_variance_jit(flow))
+    return _magnitude_variance(cv2.magnitude(flow[..., 0], flow[..., 1]))
+
+# PyAV exposes FFmpeg's multithreaded decoder directly and converts only the
+# frames we keep to BGR; cv2.VideoCapture is the fallback when it is not installed.
+try:
+    import av
+    from av.error import FFmpegError
+    _HAS_PYAV = True
+except ImportError:
+    _HAS_PYAV = False
+
+# Dense optical flow runs on the GPU when OpenCV is built with CUDA and a device is present
+try:
+    _HAS_CUDA_FLOW = cv2.cuda.getCudaEnabledDeviceCount() > 0
+except (AttributeError, cv2.error):
+    _HAS_CUDA_FLOW = False
+
+# Without CUDA, the CPU flow path runs through OpenCV's T-API (cv2.UMat) when an OpenCL
+# device sharing host memory (integrated GPU) is present, so uploads cost no copy.
+# Discrete/CPU OpenCL runtimes are skipped: the per-frame transfer would outweigh the win.
+try:
+    _USE_OPENCL = (
+        not _HAS_CUDA_FLOW and cv2.ocl.haveOpenCL()
+        and cv2.ocl.Device.getDefault().hostUnifiedMemory()
+    )
+except (AttributeError, cv2.error):
+    _USE_OPENCL = False
+if _USE_OPENCL:
+    cv2.ocl.setUseOpenCL(True)
+
+# (width, height) every frame is downscaled to before optical flow
+FLOW_FRAME_SIZE = (160, 120)
+
+# Mean absolute 0-255 difference between 32x32 thumbnails under which a sampled frame reuses the previous CNN score
+FRAME_CACHE_MAX_DIFF = 4.0
+
+# Once this many CNN samples agree (variance below the cap) on a near-certain mean,
+# the remaining 1 fps samples are skipped; optical flow keeps running for the full window.
+EARLY_EXIT_MIN_SAMPLES = 3
+EARLY_EXIT_MAX_VARIANCE = 0.01
+EARLY_EXIT_FAKE_MEAN = 0.9
+EARLY_EXIT_REAL_MEAN = 0.05
+
+# Fast path: a near-certain visual verdict backed by strong jitter makes the facial
+# and lip-sync stages moot, so their results are not waited for (see detect_fake_video)
+FAST_PATH_MIN_VISUAL = 0.95
+FAST_PATH_MIN_JITTER = 3.0
+
+# Sampled frames are queued and scored this many at a time in one CNN forward pass.
+# Deliberately below the 10 the 1 fps x 10 s window would allow: the early-exit check
+# runs after each batch, and a batch of 10 would score nearly every sample (at most 11)
+# before the first check. 4 clears EARLY_EXIT_MIN_SAMPLES on the first flush while
+# still amortizing the per-call overhead.
+CNN_BATCH_SIZE = 4
+
+def _create_nvidia_flow():
+    """
+    Hardware optical flow (Turing+ NVOF engine) sized for the 160x120 jitter frames.
+    Returns None when the build lacks it or the GPU/driver does not support it.
+    """
+    if not _HAS_CUDA_FLOW or not hasattr(cv2.cuda, "NvidiaOpticalFlow_2_0_create"):
+        return None
+    try:
+        return cv2.cuda.NvidiaOpticalFlow_2_0_create(
+            imageSize=FLOW_FRAME_SIZE,
+            perfPreset=cv2.cuda.NvidiaOpticalFlow_2_0_NV_OF_PERF_LEVEL_FAST,
+            enableTemporalHints=True
+        )
+    except cv2.error:
+        return None
+
+def _create_cuda_farneback():
+    """Same parameters as the original CPU calcOpticalFlowFarneback call (one instance per video; not thread-safe)."""
+    return cv2.cuda.FarnebackOpticalFlow_create(
+        numLevels=3, pyrScale=0.5, fastPyramids=False,
+        winSize=15, numIters=3, polyN=5, polySigma=1.2, flags=0
+    )
+
+def _create_cpu_flow():
+    """
+    DIS optical flow (ultrafast preset) for hosts without a CUDA device: patch-based
+    coarse-to-fine matching with SIMD inner loops, several times cheaper than Farneback.
+    One instance per video; instances are not thread-safe.
+    """
+    dis = cv2.DISOpticalFlow_create(cv2.DISOPTICAL_FLOW_PRESET_ULTRAFAST)
+    dis.setUseSpatialPropagation(True)
+    return dis
+
+def _open_gpu_reader(video_path):
+    """
+    NVDEC-backed reader so decoded frames land directly in VRAM (BGRA GpuMat).
+    Returns None when OpenCV lacks cudacodec or the codec/container is unsupported.
+    """
+    if not _HAS_CUDA_FLOW or not hasattr(cv2, "cudacodec"):
+        return None
+    try:
+        return cv2.cudacodec.createVideoReader(video_path)
+    except cv2.error:
+        return None
+
+def _read_frames_gpu(gpu_reader, wanted_frames):
+    """
+    Yields (frame_index, None, bgra_gpumat) for each wanted frame from a cudacodec reader.
+    nextFrame() is the only portable way to advance cudacodec; skipped frames stay in VRAM.
+    """
+    decoder_pos = 0
+    for frame_count in wanted_frames:
+        ret = True
+        try:
+            while decoder_pos <= frame_count and ret:
+                ret, gpu_frame = gpu_reader.nextFrame()
+                decoder_pos += 1
+        except cv2.error:
+            return
+        if not ret:
+            return
+        yield frame_count, None, gpu_frame
+
+def _read_frames_cv2(cap, wanted_frames):
+    """
+    Yields (frame_index, bgr_frame, None) for each wanted frame. Frames in between are
+    skipped with grab(), which advances the decoder without the BGR retrieve/copy of read().
+    """
+    decoder_pos = 0
+    for frame_count in wanted_frames:
+        grabbed = True
+        while decoder_pos < frame_count and grabbed:
+            grabbed = cap.grab()
+            decoder_pos += 1
+        if not grabbed:
+            return
+        ret, frame = cap.read()
+        decoder_pos += 1
+        if not ret:
+            return
+        yield frame_count, frame, None
+
+def _read_frames_pyav(video_path, cap, wanted_frames):
+    """
+    Yields (frame_index, bgr_frame, None) for each wanted frame using PyAV with FFmpeg
+    frame threading; only wanted frames are converted to numpy. Falls back to the
+    cv2 capture when the container cannot be opened or has no video stream.
+    """
+    try:
+        container = av.open(video_path)
+    except FFmpegError:
+        yield from _read_frames_cv2(cap, wanted_frames)
+        return
+
+    # Audio-only or otherwise video-less containers: let cv2 report the empty capture
+    if not container.streams.video:
+        container.close()
+        yield from _read_frames_cv2(cap, wanted_frames)
+        return
+
+    wanted = set(wanted_frames)
+    last_wanted = wanted_frames[-1]
+    with container:
+        stream = container.streams.video[0]
+        stream.thread_type = "AUTO"
+        try:
+            for frame_count, video_frame in enumerate(container.decode(stream)):
+                if frame_count > last_wanted:
+                    return
+                if frame_count in wanted:
+                    yield frame_count, video_frame.to_ndarray(format="bgr24"), None
+        except FFmpegError:
+            # Treat a corrupt tail like end of stream, as cv2.VideoCapture does
+            return
+
+def _score_frame_batch(frames, slots, scores):
+    """
+    Runs one batched CNN pass over the queued frames and writes each score into its
+    slot of scores. If the batch fails, each frame is retried on its own so one bad
+    frame only costs its own slot (NaN). Empties both queues.
     """
+    try:
+        for slot, (score, _) in zip(slots, detect_fake_image_batch(frames)):
+            scores[slot] = score
+    except Exception:
+        logger.exception("Error processing frame batch; scoring its frames individually")
+        for slot, frame in zip(slots, frames):
+            try:
+                scores[slot] = detect_fake_image_batch([frame])[0][0]
+            except Exception:
+                logger.exception("Error processing frame")
+                scores[slot] = np.nan
+    frames.clear()
+    slots.clear()
 
-    # --- Stage 1: Frame-by-Frame Visual Analysis ---
+def _visual_settled(scores):
+    """
+    Early exit: consistent, near-certain verdicts won't move with more samples.
+    """
+    if len(scores) < EARLY_EXIT_MIN_SAMPLES or scores.var() >= EARLY_EXIT_MAX_VARIANCE:
+        return False
+    running_mean = scores.mean()
+    return running_mean > EARLY_EXIT_FAKE_MEAN or running_mean < EARLY_EXIT_REAL_MEAN
+
+def _analyze_visual_frames(video_path):
+    """
+    Stage 1: Frame-by-frame visual analysis.
+    Returns the per-sample CNN scores and the mean optical-flow magnitude variance (jitter).
+    """
     cap = cv2.VideoCapture(video_path)
-    scores = []
-    optical_flow_mags = []
+    # Running sum/count of per-step flow magnitude variances (no per-step list)
+    jitter_sum = 0.0
+    jitter_count = 0
     prev_gray = None
-    frame_count = 0
+    # Reused CPU buffers for the flow downscale; the two gray planes alternate as prev/cur
+    flow_w, flow_h = FLOW_FRAME_SIZE
+    small_buf = np.empty((flow_h, flow_w, 3), np.uint8)
+    cur_gray_buf = np.empty((flow_h, flow_w), np.uint8)
+    prev_gray_buf = np.empty((flow_h, flow_w), np.uint8)
+    # Fuzzy frame cache: a 1 fps sample that barely differs from the last scored one reuses its score
+    last_thumb = None
+    last_scored_slot = None
+    cache_hits = 0
+    # Batched CNN queue: frames awaiting scoring, their slots, and (slot, source_slot) cache reuses
+    pending_frames = []
+    pending_slots = []
+    cache_aliases = []
+    visual_settled = False
+    
+    # Flow engine: prefer the NVOF hardware block, then CUDA Farneback, else CPU DIS.
+    # Two device buffers are swapped each step so nothing is reallocated.
+    nvidia_flow = _create_nvidia_flow()
+    cuda_flow = _create_cuda_farneback() if _HAS_CUDA_FLOW and nvidia_flow is None else None
+    use_gpu_flow = nvidia_flow is not None or cuda_flow is not None
+    cpu_flow = None if use_gpu_flow else _create_cpu_flow()
+    if use_gpu_flow:
+        prev_gpu, cur_gpu = cv2.cuda_GpuMat(), cv2.cuda_GpuMat()
+    # With a GPU flow engine, also decode on the GPU so the flow path never leaves VRAM;
+    # only the 1 fps CNN samples are downloaded.
+    gpu_reader = _open_gpu_reader(video_path) if use_gpu_flow else None
+    flow_primed = False
     
     # Smart Sampling: Determine FPS to sample approx 1 frame per second
     fps = cap.get(cv2.CAP_PROP_FPS)
     if not fps or fps <= 0: fps = 30
+    if gpu_reader is not None:
+        # The CPU capture was only needed for the container's frame rate
+        cap.release()
     
     # Limit analysis to first 10 seconds to ensure swift API response
     sample_rate = max(1, int(fps)) 
     max_frames_to_scan = int(sample_rate * 10) 
+    # Optical flow runs at roughly 5-6 FPS, the CNN at 1 FPS
+    flow_sample_rate = max(1, sample_rate // 5)
 
-    while True:
-        ret, frame = cap.read()
-        
-        # Break exactly after 10 seconds of source footage is extracted
-        if not ret or frame_count > max_frames_to_scan:
-            break
+    # The number of CNN samples is bounded up front, so scores live in a flat array
+    scores = np.empty(max_frames_to_scan // sample_rate + 1, dtype=np.float64)
+    score_count = 0
 
+    # Only these frames are ever used; the readers skip everything in between cheaply.
+    # Each reader stops early when the stream ends before 10 seconds of footage.
+    wanted_frames = sorted(
+        set(range(0, max_frames_to_scan + 1, sample_rate)) |
+        set(range(0, max_frames_to_scan + 1, flow_sample_rate))
+    )
+    if gpu_reader is not None:
+        frames = _read_frames_gpu(gpu_reader, wanted_frames)
+    elif _HAS_PYAV:
+        frames = _read_frames_pyav(video_path, cap, wanted_frames)
+    else:
+        frames = _read_frames_cv2(cap, wanted_frames)
+
+    for frame_count, frame, gpu_frame in frames:
         # --- Hardware-Accelerated Optical Flow Analysis (Jitter Detection) ---
         # Analyze at roughly 5-6 FPS to map structural displacement between consecutive captures
-        flow_sample_rate = max(1, sample_rate // 5)
         if frame_count % flow_sample_rate == 0:
             # Severely downscale to 160x120 to execute dense optical flow instantly
-            small_frame = cv2.resize(frame, (160, 120), interpolation=cv2.INTER_AREA)
-            gray = cv2.cvtColor(small_frame, cv2.COLOR_BGR2GRAY)
+            if gpu_reader is not None:
+                small_gpu = cv2.cuda.resize(gpu_frame, FLOW_FRAME_SIZE, interpolation=cv2.INTER_AREA)
+                cv2.cuda.cvtColor(small_gpu, cv2.COLOR_BGRA2GRAY, cur_gpu)
+                gray = None
+            elif _USE_OPENCL:
+                # resize / cvtColor / DIS dispatch to OpenCL kernels; the gray plane stays on the device
+                small_umat = cv2.resize(cv2.UMat(frame), FLOW_FRAME_SIZE, interpolation=cv2.INTER_AREA)
+                gray = cv2.cvtColor(small_umat, cv2.COLOR_BGR2GRAY)
+            else:
+                cv2.resize(frame, FLOW_FRAME_SIZE, dst=small_buf, interpolation=cv2.INTER_AREA)
+                gray = cv2.cvtColor(small_buf, cv2.COLOR_BGR2GRAY, dst=cur_gray_buf)
+                if use_gpu_flow:
+                    cur_gpu.upload(gray)
             
-            if prev_gray is not None:
+            if flow_primed:
                 # Computes the Dense Optical Flow (mathematical movement of pixels)
-                flow = cv2.calcOpticalFlowFarneback(prev_gray, gray, None, 0.5, 3, 15, 3, 5, 1.2, 0)
-                mag, _ = cv2.cartToPolar(flow[..., 0], flow[..., 1])
+                if nvidia_flow is not None:
+                    flow_gpu, _ = nvidia_flow.calc(prev_gpu, cur_gpu, None)
+                    # Block vectors in S10.5 fixed point; the coarse grid is a valid jitter proxy, so no upsampling
+                    flow = flow_gpu.download().astype(np.float32) * (1.0 / 32.0)
+                    step_variance = flow_magnitude_variance(flow)
+                elif cuda_flow is not None:
+                    flow_gpu = cuda_flow.calc(prev_gpu, cur_gpu, None)
+                    flow_x, flow_y = cv2.cuda.split(flow_gpu)
+                    # Only the 160x120 magnitude map comes back to the host
+                    step_variance = _magnitude_variance(cv2.cuda.magnitude(flow_x, flow_y).download())
+                else:
+                    flow = cpu_flow.calc(prev_gray, gray, None)
+                    if _USE_OPENCL:
+                        flow = flow.get()
+                    # Magnitude only: cartToPolar would also compute the unused angle field
+                    step_variance = flow_magnitude_variance(flow)
                 
                 # Deepfake face swappers create micro-jitter and unnatural boundary shifting 
                 # which causes the localized velocity variance to spike anomalously.
-                optical_flow_mags.append(np.var(mag))
+                jitter_sum += step_variance
+                jitter_count += 1
                 
             prev_gray = gray
+            cur_gray_buf, prev_gray_buf = prev_gray_buf, cur_gray_buf
+            flow_primed = True
+            if use_gpu_flow:
+                prev_gpu, cur_gpu = cur_gpu, prev_gpu
 
         # Analyze sparsely (1 fps) exactly for heavy CNN forensics
-        if frame_count % sample_rate == 0:
+        if frame_count % sample_rate == 0 and not visual_settled:
+            if frame is None:
+                frame = cv2.cvtColor(gpu_frame.download(), cv2.COLOR_BGRA2BGR)
             # Resize frame for speed (Max width 640px)
             # Heavy image forensics (ELA, Noise) are severely expensive on 4K/1080p
             height, width = frame.shape[:2]
@@ -72,89 +377,151 @@ def detect_fake_video(video_path):
                 new_dim = (640, int(height * scale_ratio))
                 frame = cv2.resize(frame, new_dim, interpolation=cv2.INTER_AREA)
 
-            # Save to temp file because image_model expects a file path
-            temp_file = tempfile.NamedTemporaryFile(suffix=".jpg", delete=False)
-            temp_path = temp_file.name
-            temp_file.close() 
-            
-            try:
-                cv2.imwrite(temp_path, frame)
-                score, img_report = detect_fake_image(temp_path)
-                scores.append(score)
-            except Exception as e:
-                print(f"Error processing frame {frame_count}: {e}")
-            finally:
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
+            # 32x32 grayscale thumbnail; mean absolute difference below the threshold means a static shot
+            thumb = cv2.cvtColor(cv2.resize(frame, (32, 32), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+            if last_thumb is not None and cv2.norm(thumb, last_thumb, cv2.NORM_L1) / thumb.size < FRAME_CACHE_MAX_DIFF:
+                # Reuse the last scored frame's result (it may still be waiting in the queue)
+                cache_aliases.append((score_count, last_scored_slot))
+                cache_hits += 1
+            else:
+                # Frames are scored in memory (no JPEG encode / temp file round-trip)
+                pending_frames.append(frame)
+                pending_slots.append(score_count)
+                last_thumb, last_scored_slot = thumb, score_count
+            score_count += 1
 
-        frame_count += 1
+            if len(pending_frames) == CNN_BATCH_SIZE:
+                _score_frame_batch(pending_frames, pending_slots, scores)
+                for slot, source_slot in cache_aliases:
+                    scores[slot] = scores[source_slot]
+                cache_aliases.clear()
+                valid = scores[:score_count]
+                visual_settled = _visual_settled(valid[~np.isnan(valid)])
 
     cap.release()
+    if pending_frames:
+        _score_frame_batch(pending_frames, pending_slots, scores)
+    for slot, source_slot in cache_aliases:
+        scores[slot] = scores[source_slot]
+    if cache_hits:
+        logger.info("Frame score cache: reused %d of %d sampled frame scores", cache_hits, score_count)
+    if nvidia_flow is not None:
+        nvidia_flow.collectGarbage()
 
-    if len(scores) == 0:
-        return {"visual": 0.01, "facial": 0.01, "lipsync": 0.01}, {"error": "No frames analyzed"}
+    mean_jitter = jitter_sum / jitter_count if jitter_count else 0.0
+    # Frames that could not be scored (NaN) are dropped, as single-frame failures were before
+    valid = scores[:score_count]
+    return valid[~np.isnan(valid)], mean_jitter
 
-    avg_score = float(np.mean(scores))
+def detect_fake_video(video_path):
+    """
+    Comprehensive video analysis pipeline.
     
-    # --- Process Optical Flow Jitter ---
-    mean_jitter = 0.0
-    if len(optical_flow_mags) > 0:
-        mean_jitter = float(np.mean(optical_flow_mags))
-        # Add slight penalty to visual score if extreme jitter detected
-        if mean_jitter > 2.5:
-            avg_score = min(0.99, avg_score + 0.25)
+    Stages:
+    1. Visual Artifact Detection: Samples frames and checks for GAN noise/artifacts.
+    2. Facial Biometrics: Tracks blinking and geometric consistency.
+    3. Lip-Sync Analysis: Checks correlation between audio and visual lip movements.
     
-    # --- Stage 2: Facial Biometric Analysis ---
+    Optimizations:
+    - Frame Sampling: 1 frame/sec to reduce load.
+    - Early Exit: Stops after 10 seconds of analysis.
+    - Downscaling: Resizes large frames to 640px max width.
+    - Parallel Stages: Stages 2 and 3 start alongside Stage 1 on a small thread pool.
+    - Fast Path: When the mean frame score exceeds FAST_PATH_MIN_VISUAL (0.95) and the
+      optical-flow jitter exceeds FAST_PATH_MIN_JITTER (3.0), Stages 2 and 3 are cancelled
+      (they poll a shared event between frames) and joined before returning; their checks
+      are reported as skipped and their components are omitted.
+    """
     annotated_face_path = None
-    try:
-        # Analyzes blinking rates, eye aspect ratio variance
-        facial_score, annotated_face_path = analyze_facial_landmarks(video_path)
-    except Exception as e:
-        print(f"Facial analysis failed: {e}")
-        facial_score = 0.01
-
-    # --- Stage 3: Audio-Visual Lip-Sync ---
     lipsync_graph = None
-    try:
-        # Checks mouth-opening vs audio-energy correlation
-        lipsync_score, correlation, lipsync_graph = detect_lipsync_mismatch(video_path)
-    except Exception as e:
-        print(f"Lip-sync analysis failed: {e}")
-        lipsync_score = 0.01
-        correlation = 0.0
+
+    # Stages 2 and 3 each open the video themselves and spend most of their time in
+    # MediaPipe / FFmpeg calls that release the GIL, so they overlap Stage 1.
+    # Leaving the with-block joins both, so nothing outlives this call.
+    cancel_stages = threading.Event()
+    with ThreadPoolExecutor(max_workers=2) as stage_pool:
+        facial_future = stage_pool.submit(analyze_facial_landmarks, video_path, cancel_stages)
+        lipsync_future = stage_pool.submit(detect_lipsync_mismatch, video_path, cancel_stages)
+
+        # --- Stage 1: Frame-by-Frame Visual Analysis ---
+        try:
+            scores, mean_jitter = _analyze_visual_frames(video_path)
+        except BaseException:
+            cancel_stages.set()
+            raise
+
+        if len(scores) == 0:
+            cancel_stages.set()
+            return {"visual": 0.01, "facial": 0.01, "lipsync": 0.01}, {"error": "No frames analyzed"}
+
+        avg_score = float(scores.mean())
+        skip_stages = avg_score > FAST_PATH_MIN_VISUAL and mean_jitter > FAST_PATH_MIN_JITTER
+
+        if skip_stages:
+            cancel_stages.set()
+        else:
+            # --- Stage 2: Facial Biometric Analysis ---
+            try:
+                # Analyzes blinking rates, eye aspect ratio variance
+                facial_score, annotated_face_path = facial_future.result()
+            except Exception:
+                logger.exception("Facial analysis failed")
+                facial_score = 0.01
+
+            # --- Stage 3: Audio-Visual Lip-Sync ---
+            try:
+                # Checks mouth-opening vs audio-energy correlation
+                lipsync_score, correlation, lipsync_graph = lipsync_future.result()
+            except Exception:
+                logger.exception("Lip-sync analysis failed")
+                lipsync_score = 0.01
+                correlation = 0.0
+
+    # --- Process Optical Flow Jitter ---
+    # Add slight penalty to visual score if extreme jitter detected
+    if mean_jitter > 2.5:
+        avg_score = min(0.99, avg_score + 0.25)
 
     # NOTE: Fusion happens in main.py. Here we return components.
     
     # --- Report Generation ---
     # High variance in frame scores or high optical flow jitter suggests temporal flickering
     flicker_risk = mean_jitter > 2.5
-    
-    # Heuristic inference for report text
-    blinking_issue = facial_score > 0.8
-    sync_issue = lipsync_score > 0.6
 
     video_report = {
         "temporal_consistency": {
             "pass": bool(not flicker_risk),
             "detail": f"Stable optical flow inter-frame tracking (Jitter: {mean_jitter:.2f})." if not flicker_risk else f"Detected aberrant structural shifting and boundary jitter common in deepfakes (Jitter: {mean_jitter:.2f})."
         },
-        "blinking_patterns": {
-            "pass": bool(not blinking_issue), 
-            "detail": "Natural blinking rate observed." if not blinking_issue else "Abnormal blinking patterns (staring or irregular) detected."
-        },
-        "lip_sync": {
-            "pass": bool(not sync_issue),
-            "detail": f"Lip movements synchronized with audio (Corr: {correlation:.2f})." if not sync_issue else "Significant mismatch between lip movement and speech audio.",
-            "graph": lipsync_graph
-        },
         "annotated_image": annotated_face_path
     }
 
     # Return raw components for robust weighted fusion in the main controller
     components = {
-        "visual": float(avg_score),
-        "facial": float(facial_score),
-        "lipsync": float(lipsync_score)
+        "visual": float(avg_score)
     }
-    return components, video_report
 
+    if skip_stages:
+        # Stages 2 and 3 were cancelled: pass=None marks the checks as skipped, and their
+        # components are omitted so they cannot win the threat-source argmax
+        skipped_detail = "Not measured: frame-level and optical-flow evidence was already conclusive."
+        video_report["blinking_patterns"] = {"pass": None, "detail": skipped_detail}
+        video_report["lip_sync"] = {"pass": None, "detail": skipped_detail, "graph": None}
+        return components, video_report
+
+    # Heuristic inference for report text
+    blinking_issue = facial_score > 0.8
+    sync_issue = lipsync_score > 0.6
+
+    video_report["blinking_patterns"] = {
+        "pass": bool(not blinking_issue), 
+        "detail": "Natural blinking rate observed." if not blinking_issue else "Abnormal blinking patterns (staring or irregular) detected."
+    }
+    video_report["lip_sync"] = {
+        "pass": bool(not sync_issue),
+        "detail": f"Lip movements synchronized with audio (Corr: {correlation:.2f})." if not sync_issue else "Significant mismatch between lip movement and speech audio.",
+        "graph": lipsync_graph
+    }
+    components["facial"] = float(facial_score)
+    components["lipsync"] = float(lipsync_score)
+    return components, video_report
@@ -1,15 +1,76 @@
 import requests
 import os
-import traceback
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger("truthguard.virustotal")
 
 # VirusTotal API Key (Free tier allows 4 requests per minute)
 # In a real environment, load this from python-dotenv or environment variables
 VT_API_KEY = os.environ.get("VT_API_KEY", "YOUR_VIRUSTOTAL_API_KEY") 
 
+# A 429 on the free tier means the per-minute quota is spent, so waiting on it would stall
+# the upload for up to a minute: it is reported as rate_limited straight away. Only transient
+# server/connection errors get a single quick retry; the final response is returned, not raised.
+_VT_RETRY = Retry(
+    total=1,
+    backoff_factor=0.5,
+    status_forcelist=[500, 502, 503, 504],
+    allowed_methods=["GET"],
+    raise_on_status=False
+)
+
+# One pooled session per process: repeated lookups reuse the warm TLS connection
+# instead of paying DNS + handshake on every scan.
+_VT_SESSION = requests.Session()
+_VT_SESSION.headers.update({
+    "accept": "application/json",
+    "x-apikey": VT_API_KEY
+})
+_VT_SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=_VT_RETRY))
+
+# Dedicated threads for the network-bound lookups (sized to the session pool),
+# so waiting on VirusTotal never occupies a worker meant for CPU-bound analysis.
+_VT_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="virustotal")
+
+# VirusTotal verdicts are keyed by SHA-256, so re-uploads can reuse them.
+# Clean results expire sooner so a newly flagged file is picked up quickly.
+VT_CACHE_TTL_MALWARE = 3600
+VT_CACHE_TTL_CLEAN = 300
+VT_CACHE_MAX_ENTRIES = 4096
+
+# In-process cache: sha256 -> (expires_at, report); insertion order doubles as age order
+_vt_cache = {}
+_vt_cache_lock = threading.Lock()
+
 def scan_hash_virustotal(sha256_hash: str):
     """
     Queries the VirusTotal API (v3) with a file's SHA-256 hash.
     Returns whether the file is considered malicious to prevent zero-day attacks.
+    Successful verdicts are cached in-process for VT_CACHE_TTL_* seconds.
+    """
+    cached = _vt_cache.get(sha256_hash)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+
+    report = _query_virustotal(sha256_hash)
+
+    # Failed/simulated lookups are not cached so the next upload retries them
+    if "error" not in report:
+        ttl = VT_CACHE_TTL_MALWARE if report.get("is_malware") else VT_CACHE_TTL_CLEAN
+        with _vt_cache_lock:
+            _vt_cache.pop(sha256_hash, None)
+            _vt_cache[sha256_hash] = (time.monotonic() + ttl, report)
+            while len(_vt_cache) > VT_CACHE_MAX_ENTRIES:
+                del _vt_cache[next(iter(_vt_cache))]
+    return report
+
+def _query_virustotal(sha256_hash: str):
+    """
+    Uncached VirusTotal v3 file lookup.
     """
     # If no real API key is provided, we simulate a clean response 
     # so the app doesn't break for demonstration purposes.
@@ -24,14 +85,10 @@ def scan_hash_virustotal(sha256_hash: str):
         }
 
     url = f"https://www.virustotal.com/api/v3/files/{sha256_hash}"
-    headers = {
-        "accept": "application/json",
-        "x-apikey": VT_API_KEY
-    }
 
     try:
         print(f"[VIRUSTOTAL] Pinging global threat intelligence for hash: {sha256_hash}...")
-        response = requests.get(url, headers=headers, timeout=10)
+        response = _VT_SESSION.get(url, timeout=10)
         
         # 404 means the file hash is unknown to VirusTotal (Likely safe/new)
         if response.status_code == 404:
@@ -42,6 +99,11 @@ def scan_hash_virustotal(sha256_hash: str):
                 "report_link": None,
                 "note": "Hash not found in VT database."
             }
+
+        # Throttled: report it instead of a generic HTTP error (not retried, see _VT_RETRY)
+        if response.status_code == 429:
+            logger.warning("VirusTotal rate limit exceeded (free tier allows 4 requests per minute); %s not checked", sha256_hash)
+            return {"is_malware": False, "rate_limited": True, "error": "VirusTotal rate limit exceeded"}
             
         response.raise_for_status()
         data = response.json()
@@ -72,5 +134,12 @@ def scan_hash_virustotal(sha256_hash: str):
         print(f"[VIRUSTOTAL API ERROR] {http_err}")
         return {"is_malware": False, "error": str(http_err)}
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("VirusTotal lookup failed")
         return {"is_malware": False, "error": str(e)}
+
+def scan_hash_virustotal_async(sha256_hash: str):
+    """
+    Starts scan_hash_virustotal in the background and returns its concurrent.futures.Future,
+    letting callers overlap the network round trip with local analysis.
+    """
+    return _VT_EXECUTOR.submit(scan_hash_virustotal, sha256_hash)
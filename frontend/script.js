@@ -71,8 +71,13 @@ function displayResult(data, file) {
         for (const [key, check] of Object.entries(report)) {
             if (key === 'error' || key === 'annotated_image' || key === 'waveform_graph') continue;
             // For boolean checks, true is good (Green), false is bad (Red) depending on logic.
-            const icon = check.pass ? '<i class="fas fa-check-circle" style="color: #00FF41;"></i>' : '<i class="fas fa-times-circle" style="color: #FF003C;"></i>';
-            const statusColor = check.pass ? '#00FF41' : '#FF003C';
+            // null means the check was skipped (neutral grey).
+            let icon = check.pass ? '<i class="fas fa-check-circle" style="color: #00FF41;"></i>' : '<i class="fas fa-times-circle" style="color: #FF003C;"></i>';
+            let statusColor = check.pass ? '#00FF41' : '#FF003C';
+            if (check.pass === null) {
+                icon = '<i class="fas fa-minus-circle" style="color: var(--text-muted);"></i>';
+                statusColor = 'var(--text-muted)';
+            }
 
             // Format key text (e.g. "noise_patterns" -> "Noise Patterns")
             const formattedKey = key.split('_').map(word => word.charAt(0).toUpperCase() + word.slice(1)).join(' ');
@@ -195,7 +200,7 @@ function displayResult(data, file) {
 
                 <!-- 2. Visual / Audio Analysis -->
                 ${data.checks.visual ? `
-                <div style="padding: 20px; background: rgba(0,0,0,0.2); border: 1px solid var(--border-color); border-radius: 12px; border-left: 4px solid ${data.checks.visual.pass ? '#00FF41' : '#FF003C'};">
+                <div style="padding: 20px; background: rgba(0,0,0,0.2); border: 1px solid var(--border-color); border-radius: 12px; border-left: 4px solid ${data.checks.visual.pass === null ? 'var(--text-muted)' : (data.checks.visual.pass ? '#00FF41' : '#FF003C')};">
                     <strong style="font-size: 1.1rem; color: var(--text-main); display:flex; align-items:center; gap:8px;"><i class="fas fa-eye" style="color: var(--accent-cyan);"></i> Visual Integrity Check</strong>
                     <p style="margin: 10px 0 0; font-size: 1rem; color: var(--text-muted);">${data.checks.visual.detail}</p>
                     
@@ -238,6 +243,12 @@ function displayResult(data, file) {
                     ${renderDetailedChecks('LSB Analytics', data.checks.steganography.report)}
                 </div>` : ''}
 
+                ${data.checks.virustotal ? `
+                <div style="padding: 20px; background: rgba(0,0,0,0.2); border: 1px solid var(--border-color); border-radius: 12px; border-left: 4px solid ${data.checks.virustotal.pass === null ? 'var(--text-muted)' : (data.checks.virustotal.pass ? '#00FF41' : '#FF003C')};">
+                    <strong style="font-size: 1.1rem; color: var(--text-main); display:flex; align-items:center; gap:8px;"><i class="fas fa-shield-virus" style="color: var(--text-muted);"></i> VirusTotal Threat Intelligence</strong>
+                    <p style="margin: 10px 0 0; font-size: 1rem; color: var(--text-muted);">${data.checks.virustotal.detail}</p>
+                </div>` : ''}
+
             </div>
 
             <!-- 3. Final Verdict -->
@@ -313,6 +324,11 @@ document.addEventListener('DOMContentLoaded', () => {
     // Uses the current window location to determine the API base, fallback to localhost for development.
     const API_BASE = window.location.origin;
     const WS_BASE = window.location.origin.replace(/^http/, 'ws');
+    // Live verdicts arrive as binary JSON frames (orjson on the backend)
+    const wsDecoder = new TextDecoder();
+    const parseWsMessage = (event) => JSON.parse(
+        typeof event.data === 'string' ? event.data : wsDecoder.decode(event.data)
+    );
 
     const dropAreas = document.querySelectorAll('.drop-area');
     const fileInputs = document.querySelectorAll('.file-input');
@@ -583,6 +599,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
             // 1. Establish WebSocket Connection
             ws = new WebSocket(`${WS_BASE}/ws/analyze_audio`);
+            ws.binaryType = 'arraybuffer';
 
             ws.onopen = () => {
                 console.log("WebSocket connected. Starting stream...");
@@ -592,7 +609,7 @@ document.addEventListener('DOMContentLoaded', () => {
             };
 
             ws.onmessage = (event) => {
-                const data = JSON.parse(event.data);
+                const data = parseWsMessage(event);
                 if (data.status === 'success') {
                     const verdictEl = document.getElementById('live-verdict');
                     const probEl = document.getElementById('live-prob');
@@ -744,6 +761,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
             // 2. Establish WebSocket Connection
             videoWs = new WebSocket(`${WS_BASE}/ws/analyze_video`);
+            videoWs.binaryType = 'arraybuffer';
 
             videoWs.onopen = () => {
                 console.log("Video WebSocket connected. Starting frame streaming...");
@@ -756,7 +774,7 @@ document.addEventListener('DOMContentLoaded', () => {
             };
 
             videoWs.onmessage = (event) => {
-                const data = JSON.parse(event.data);
+                const data = parseWsMessage(event);
                 if (data.status === 'success') {
                     const verdictEl = document.getElementById('video-verdict');
                     const probEl = document.getElementById('video-prob');
@@ -806,11 +824,13 @@ document.addEventListener('DOMContentLoaded', () => {
         // Draw video frame to hidden canvas
         context.drawImage(webcamPreview, 0, 0, webcamCanvas.width, webcamCanvas.height);
 
-        // Convert canvas image to Base64 (compressing slightly)
-        const frameData = webcamCanvas.toDataURL('image/jpeg', 0.8);
-
-        // Send Base64 payload over WebSocket
-        videoWs.send(frameData);
+        // Encode the canvas as a raw JPEG (compressing slightly) and send it as a
+        // binary frame: no base64 inflation and no decoding step on the backend
+        webcamCanvas.toBlob((blob) => {
+            if (blob && videoWs && videoWs.readyState === WebSocket.OPEN) {
+                videoWs.send(blob);
+            }
+        }, 'image/jpeg', 0.8);
     }
 
     function stopLiveVideo() {
@@ -0,0 +1,23 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+Image = pytest.importorskip("PIL.Image")
+
+from backend.batch import scan_many
+
+
+def _write_png(path, seed):
+    pixels = np.random.default_rng(seed).integers(0, 256, size=(32, 32, 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(path)
+    return str(path)
+
+
+def test_scan_many_keeps_input_order_and_keys(tmp_path):
+    paths = [_write_png(tmp_path / f"sample_{i}.png", i) for i in range(3)]
+
+    results = list(scan_many(paths, max_workers=1))
+
+    assert [r["path"] for r in results] == paths
+    for result in results:
+        assert set(result) == {"path", "metadata_score", "metadata", "steganography"}
@@ -0,0 +1,39 @@
+import datetime
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("reportlab")
+
+from backend.report import generate_pdf_reports
+
+
+def _scan(scan_id, verdict):
+    details = {
+        "explanation": "Test scan.",
+        "components": {"face": 90.0, "background": 95.0, "voice": "N/A", "body": 92.0},
+        "checks": {"metadata": {"pass": True, "detail": "No major risks", "report": {"format": "PNG"}}},
+    }
+    return SimpleNamespace(
+        scan_id=scan_id,
+        filename=f"{scan_id}.png",
+        timestamp=datetime.datetime(2024, 1, 1),
+        verdict=verdict,
+        fake_probability=0.1 if verdict == "REAL" else 0.9,
+        details_json=json.dumps(details),
+    )
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_generate_pdf_reports_keeps_input_order(tmp_path, max_workers):
+    scans = [_scan("TG-AAAA0001", "REAL"), _scan("TG-BBBB0002", "FAKE")]
+
+    paths = generate_pdf_reports(scans, str(tmp_path), max_workers=max_workers)
+
+    assert [os.path.basename(p) for p in paths] == [
+        "TruthGuard_Report_TG-AAAA0001.pdf",
+        "TruthGuard_Report_TG-BBBB0002.pdf",
+    ]
+    assert all(os.path.getsize(p) > 0 for p in paths)